@@ -10,6 +10,11 @@ from ironswarm.logging_config import configure_logging
 from ironswarm.metrics.collector import collector
 from ironswarm.node import Node
 
+try:  # pragma: no cover - optional speedup
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
 log = logging.getLogger(__name__)
 
 
@@ -109,6 +114,13 @@ async def async_main():
         scenarios_dir=scenarios_dir,
     )
 
+    # Python 3.12+: start tasks eagerly so sends that complete without
+    # blocking never round-trip through the ready queue. Set here rather than
+    # in Node so applications embedding a Node keep their own task factory.
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
     await node.bind()
     try:
         await node.run()
@@ -122,7 +134,11 @@ async def async_main():
 def main():
     """CLI entry point - creates and runs the async event loop."""
     try:
-        asyncio.run(async_main())
+        if uvloop is not None:
+            # libuv-backed loop: cheaper task switches for the gossip/metrics loops
+            uvloop.run(async_main())
+        else:
+            asyncio.run(async_main())
     except KeyboardInterrupt:
         # asyncio.run handles cleanup, just exit cleanly
         pass
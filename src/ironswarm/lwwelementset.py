@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import time
 from collections import defaultdict
+from collections.abc import Callable, Iterable
 from typing import Any
 
 log = logging.getLogger(__name__)
@@ -24,6 +25,14 @@ class LWWElementSet:
         # element -> dict including timestamp and optional metadata
         self.add_set: defaultdict[Any, dict[str, Any]] = defaultdict(dict)
         self.remove_set: defaultdict[Any, dict[str, Any]] = defaultdict(dict)
+        # bumped whenever add/remove changes an entry so callers can detect change cheaply
+        self.epoch: int = 0
+        # optional hook called with the element after each such change
+        self.on_change: Callable[[Any], None] | None = None
+        # live (element, metadata) pairs and their keys, valid while epoch matches
+        self._live_epoch: int = -1
+        self._live_entries: list[tuple[Any, dict[str, Any]]] = []
+        self._live_keys: set[Any] = set()
 
     def add(
         self, element: Any, timestamp: float | None = None, **added_values: Any
@@ -33,7 +42,12 @@ class LWWElementSet:
         old_ts = self.add_set[element].get("timestamp", 0.0)
 
         if timestamp >= old_ts:
-            self.add_set[element] = {"timestamp": timestamp, **added_values}
+            entry = {"timestamp": timestamp, **added_values}
+            if entry != self.add_set[element]:
+                self.add_set[element] = entry
+                self.epoch += 1
+                if self.on_change is not None:
+                    self.on_change(element)
 
     def remove(
         self, element: Any, timestamp: float | None = None, **removed_values: Any
@@ -48,7 +62,12 @@ class LWWElementSet:
         old_ts = self.remove_set[element].get("timestamp", 0.0)
 
         if timestamp >= old_ts:
-            self.remove_set[element] = {"timestamp": timestamp, **removed_values}
+            entry = {"timestamp": timestamp, **removed_values}
+            if entry != self.remove_set[element]:
+                self.remove_set[element] = entry
+                self.epoch += 1
+                if self.on_change is not None:
+                    self.on_change(element)
 
     def lookup(self, element: Any) -> dict[str, Any] | bool:
         """Check if element is in set and return its metadata.
@@ -70,7 +89,8 @@ class LWWElementSet:
         Returns:
             Set of element keys currently in the set.
         """
-        return {e for e in self.add_set if self.lookup(e)}
+        self._refresh_live()
+        return set(self._live_keys)
 
     def values(self) -> list[tuple[Any, dict[str, Any]]]:
         """Get list of (element, metadata) tuples for all current elements.
@@ -80,7 +100,26 @@ class LWWElementSet:
             Returns tuples (not dict) to support unpacking in loops:
             `for key, metadata in lww.values():`
         """
-        return [(e, m) for e, m in self.add_set.items() if self.lookup(e)]
+        self._refresh_live()
+        return list(self._live_entries)
+
+    def __contains__(self, element: Any) -> bool:
+        """Check if element is currently in the set, without copying keys()."""
+        self._refresh_live()
+        return element in self._live_keys
+
+    def __len__(self) -> int:
+        """Number of elements currently in the set."""
+        self._refresh_live()
+        return len(self._live_keys)
+
+    def _refresh_live(self) -> None:
+        """Rebuild the live entries for keys()/values() only after a change."""
+        if self._live_epoch == self.epoch:
+            return
+        self._live_entries = [(e, m) for e, m in self.add_set.items() if self.lookup(e)]
+        self._live_keys = {e for e, _ in self._live_entries}
+        self._live_epoch = self.epoch
 
     def merge(self, other: LWWElementSet) -> None:
         """Merge another LWW-Element-Set into this one.
@@ -105,6 +144,75 @@ class LWWElementSet:
                 timestamp=meta["timestamp"],
             )
 
+    def digest(self) -> dict[str, dict[Any, float]]:
+        """Summarise the set as element timestamps for anti-entropy gossip.
+
+        Returns:
+            Dictionary with 'add_set' and 'remove_set' keys mapping each
+            element to its timestamp; metadata is left out.
+        """
+        return {
+            "add_set": {k: v["timestamp"] for k, v in self.add_set.items() if v.get("timestamp")},
+            "remove_set": {
+                k: v["timestamp"] for k, v in self.remove_set.items() if v.get("timestamp")
+            },
+        }
+
+    def delta(self, digest: dict[str, dict[Any, float]]) -> LWWElementSet:
+        """Get the entries that are newer here than in a peer's digest.
+
+        Args:
+            digest: Result of `digest()` on the peer's copy of this set.
+
+        Returns:
+            New LWWElementSet holding only the entries the peer is missing.
+        """
+        delta = LWWElementSet()
+        for name, entries, target in (
+            ("add_set", self.add_set, delta.add_set),
+            ("remove_set", self.remove_set, delta.remove_set),
+        ):
+            theirs = digest.get(name, {})
+            for e, meta in entries.items():
+                timestamp = meta.get("timestamp")
+                if timestamp and timestamp > theirs.get(e, 0.0):
+                    target[e] = meta
+        return delta
+
+    def newer_in(self, digest: dict[str, dict[Any, float]]) -> list[Any]:
+        """List elements a peer's digest holds newer entries for than this set.
+
+        Args:
+            digest: Result of `digest()` on the peer's copy of this set.
+
+        Returns:
+            Elements whose add or remove timestamp is newer on the peer.
+        """
+        wanted = {
+            e
+            for name, entries in (("add_set", self.add_set), ("remove_set", self.remove_set))
+            for e, timestamp in digest.get(name, {}).items()
+            if timestamp > entries.get(e, {}).get("timestamp", 0.0)
+        }
+        return list(wanted)
+
+    def subset(self, elements: Iterable[Any]) -> LWWElementSet:
+        """Get a new set holding only the entries for `elements`.
+
+        Args:
+            elements: Elements to copy, e.g. the result of a peer's `newer_in()`.
+
+        Returns:
+            New LWWElementSet with the add/remove entries of those elements.
+        """
+        subset = LWWElementSet()
+        for e in elements:
+            if self.add_set.get(e, {}).get("timestamp"):
+                subset.add_set[e] = self.add_set[e]
+            if self.remove_set.get(e, {}).get("timestamp"):
+                subset.remove_set[e] = self.remove_set[e]
+        return subset
+
     def to_dict(self) -> dict[str, dict[Any, dict[str, Any]]]:
         """Convert to dictionary representation for serialization.
 
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import argparse
-from collections.abc import Callable, Sequence
-from copy import deepcopy
+import heapq
+import os
+from collections.abc import Callable, Iterable, Sequence
 from pathlib import Path
 from typing import Any
 
@@ -13,25 +14,47 @@ try:
     import matplotlib.dates as mdates
     import matplotlib.pyplot as plt
     from matplotlib import colors as mcolors
+    from matplotlib.figure import Figure
     from matplotlib.patches import PathPatch
     from cycler import cycler
-    import numpy as np
 except ImportError:  # pragma: no cover
     matplotlib = None
     plt = None
     mdates = None
     cycler = None
     mcolors = None
+    Figure = None
     PathPatch = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
     np = None
 
+try:  # pragma: no cover - optional accelerator
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+try:  # pragma: no cover - optional streaming parser
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
 import math
-from collections import Counter, defaultdict
+import threading
+from dataclasses import dataclass
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
 
 from ironswarm.metrics.report import load_snapshot
+from ironswarm.metrics_snapshot import iter_snapshot_records, loads_snapshot_data
 
 Snapshot = dict[str, Any]
+HistogramIndex = dict[tuple[str, tuple[tuple[str, str], ...]], dict[str, Any]]
+TimeBins = tuple["np.ndarray", "np.ndarray"]
 
 
 _ACCENT_COLORS = [
@@ -61,6 +84,36 @@ _GRID_COLOR = "#1e2636"
 _P50_COLOR = "#9FE2BF"
 _P95_COLOR = "#FFDD57"
 _P99_COLOR = "#FF6B6B"
+_IMAGE_FORMATS = ("png", "webp", "svg")
+_MISSING_EVENTS_MESSAGE = (
+    "Snapshot missing HTTP request events. "
+    "Please re-run your scenario with a newer ironswarm version that records "
+    "per-request events."
+)
+_DEFAULT_DPI = 120
+
+if np is not None:
+    _VGRAD = np.linspace(0, 1, 256, dtype=np.float32).reshape(-1, 1)
+    _HGRAD = _VGRAD.T
+else:  # pragma: no cover - depends on optional extra
+    _VGRAD = None
+    _HGRAD = None
+
+_GRADIENT_CMAPS: dict[tuple[str, str], Any] = {}
+
+# Figures are reused per thread (keyed by figsize) because the web API renders
+# graphs from executor threads. They are plain Figure objects kept out of
+# pyplot's global registry; generate_graphs drops them when it returns, so
+# only the CLI keeps them across calls.
+_FIG_CACHE = threading.local()
+
+# Above this many patches, gradient overlays cost more than they add; fall back
+# to flat fills. IRONSWARM_GRAPH_STYLE=flat|rich overrides the budget.
+_GRADIENT_PATCH_BUDGET = 24
+
+# Mean events per latency bucket above which per-bucket selection beats one
+# global (bin, duration) sort.
+_PARTITION_MIN_BUCKET = 256
 
 
 def _empty_snapshot() -> Snapshot:
@@ -74,23 +127,36 @@ def _empty_snapshot() -> Snapshot:
 def _load_snapshot_source(source: str | Path) -> Snapshot:
     source_path = Path(source)
     if source_path.is_dir():
-        files = sorted(p for p in source_path.rglob("*.json") if p.is_file())
+        # JSON fragments plus the hourly snapshot logs nodes write under metrics_dir
+        files = sorted(
+            p
+            for pattern in ("*.json", "metrics_*.log")
+            for p in source_path.rglob(pattern)
+            if p.is_file()
+        )
         if not files:
             raise RuntimeError(f"No JSON snapshots found in directory {source_path}")
         aggregated = _empty_snapshot()
+        histogram_index: HistogramIndex = {}
         for file in files:
+            if file.suffix == ".log":
+                for _, snapshot_json in iter_snapshot_records(file):
+                    _merge_snapshot(aggregated, loads_snapshot_data(snapshot_json), histogram_index)
+                continue
             data = load_snapshot(file)
-            _merge_snapshot(aggregated, data)
+            _merge_snapshot(aggregated, data, histogram_index)
         return aggregated
     if not source_path.exists():
         raise RuntimeError(f"Snapshot path {source_path} does not exist")
     return load_snapshot(source_path)
 
 
-def _merge_snapshot(target: Snapshot, data: Snapshot) -> None:
+def _merge_snapshot(
+    target: Snapshot, data: Snapshot, histogram_index: HistogramIndex | None = None
+) -> None:
     _merge_events(target, data)
     _merge_counters(target, data)
-    _merge_histograms(target, data)
+    _merge_histograms(target, data, histogram_index)
 
 
 def _merge_events(target: Snapshot, data: Snapshot) -> None:
@@ -107,12 +173,26 @@ def _merge_counters(target: Snapshot, data: Snapshot) -> None:
         target_metric.setdefault("samples", []).extend(samples)
 
 
-def _merge_histograms(target: Snapshot, data: Snapshot) -> None:
+def _merge_histograms(
+    target: Snapshot, data: Snapshot, index: HistogramIndex | None = None
+) -> None:
+    # Pass one index across repeated merges so it is built once; samples from
+    # ``data`` are adopted without copying and merged into in place.
     target_hists = target.setdefault("histograms", {})
+    if index is None:
+        index = {
+            (metric, _histogram_key(sample)): sample
+            for metric, payload in target_hists.items()
+            for sample in payload.get("samples", [])
+        }
     for metric, payload in data.get("histograms", {}).items():
         target_metric = target_hists.setdefault(metric, {"samples": []})
-        merged = _merge_histogram_samples(target_metric.get("samples", []), payload.get("samples", []))
-        target_metric["samples"] = merged
+        _merge_histogram_samples(
+            metric,
+            target_metric.setdefault("samples", []),
+            payload.get("samples", []),
+            index,
+        )
 
 
 def _histogram_key(sample: dict[str, Any]) -> tuple[tuple[str, str], ...]:
@@ -121,25 +201,23 @@ def _histogram_key(sample: dict[str, Any]) -> tuple[tuple[str, str], ...]:
 
 
 def _merge_histogram_samples(
+    metric: str,
     existing_samples: list[dict[str, Any]],
     new_samples: list[dict[str, Any]],
+    index: HistogramIndex,
 ) -> list[dict[str, Any]]:
-    index: dict[tuple[tuple[str, str], ...], dict[str, Any]] = {
-        _histogram_key(sample): sample for sample in existing_samples
-    }
     for sample in new_samples:
-        key = _histogram_key(sample)
-        if key in index:
-            target_sample = index[key]
-            target_sample["count"] = target_sample.get("count", 0) + sample.get("count", 0)
-            target_sample["sum"] = target_sample.get("sum", 0.0) + sample.get("sum", 0.0)
-            target_sample["buckets"] = _merge_histogram_buckets(
-                target_sample.get("buckets", []), sample.get("buckets", [])
-            )
-        else:
-            sample_copy = deepcopy(sample)
-            existing_samples.append(sample_copy)
-            index[key] = sample_copy
+        key = (metric, _histogram_key(sample))
+        target_sample = index.get(key)
+        if target_sample is None:
+            existing_samples.append(sample)
+            index[key] = sample
+            continue
+        target_sample["count"] = target_sample.get("count", 0) + sample.get("count", 0)
+        target_sample["sum"] = target_sample.get("sum", 0.0) + sample.get("sum", 0.0)
+        target_sample["buckets"] = _merge_histogram_buckets(
+            target_sample.get("buckets", []), sample.get("buckets", [])
+        )
     return existing_samples
 
 
@@ -192,7 +270,16 @@ def _configure_theme() -> None:
 
 
 def _theme_figure(figsize: tuple[float, float]) -> tuple[Any, Any]:
-    fig, ax = plt.subplots(figsize=figsize)
+    figures: dict[tuple[float, float], Any] | None = getattr(_FIG_CACHE, "figures", None)
+    if figures is None:
+        figures = _FIG_CACHE.figures = {}
+    fig = figures.get(figsize)
+    if fig is None:
+        fig = Figure(figsize=figsize, layout="constrained")
+        figures[figsize] = fig
+    else:
+        fig.clf()
+    ax = fig.add_subplot()
     fig.patch.set_facecolor(_BACKGROUND_COLOR)
     ax.set_facecolor(_PANEL_COLOR)
     for spine in ax.spines.values():
@@ -201,6 +288,15 @@ def _theme_figure(figsize: tuple[float, float]) -> tuple[Any, Any]:
     return fig, ax
 
 
+def _close_cached_figures() -> None:
+    figures = getattr(_FIG_CACHE, "figures", None)
+    if not figures:
+        return
+    for fig in figures.values():
+        fig.clf()
+    figures.clear()
+
+
 def _restyle_legend(legend: Any | None) -> None:
     if legend is None:
         return
@@ -215,14 +311,24 @@ def _restyle_legend(legend: Any | None) -> None:
         title.set_color(_TEXT_COLOR)
 
 
+@lru_cache(maxsize=256)
+def _to_rgb_cached(color: str) -> tuple[float, float, float]:
+    return mcolors.to_rgb(color)
+
+
+@lru_cache(maxsize=512)
+def _blend_hex(color: str, target: str, ratio: float) -> str:
+    base_rgb = _to_rgb_cached(color)
+    target_rgb = _to_rgb_cached(target)
+    blended = tuple((1 - ratio) * base + ratio * target for base, target in zip(base_rgb, target_rgb))
+    return mcolors.to_hex(blended)
+
+
 def _blend_colors(color: str, target: str, ratio: float) -> str:
     if mcolors is None:
         return color
-    ratio = max(0.0, min(1.0, ratio))
-    base_rgb = mcolors.to_rgb(color)
-    target_rgb = mcolors.to_rgb(target)
-    blended = tuple((1 - ratio) * base + ratio * target for base, target in zip(base_rgb, target_rgb))
-    return mcolors.to_hex(blended)
+    ratio = round(max(0.0, min(1.0, ratio)), 2)
+    return _blend_hex(color, target, ratio)
 
 
 def _apply_background_gradient(
@@ -257,14 +363,26 @@ def _apply_background_gradient(
     ax.set_ylim(y0, y1)
 
 
+def _use_gradients(patch_count: int) -> bool:
+    style = os.getenv("IRONSWARM_GRAPH_STYLE", "").strip().lower()
+    if style == "flat":
+        return False
+    if style == "rich":
+        return True
+    return patch_count <= _GRADIENT_PATCH_BUDGET
+
+
 def _enhance_stackplot(ax: Any, collections: Sequence[Any], palette: Sequence[str]) -> None:
     if PathPatch is None:
         return
+    gradients = _use_gradients(len(collections))
     for collection, color in zip(collections, palette):
         face_color = _blend_colors(color, _BACKGROUND_COLOR, 0.35)
         collection.set_facecolor(face_color)
         collection.set_edgecolor(_blend_colors(color, _BACKGROUND_COLOR, 0.65))
         collection.set_alpha(0.65)
+        if not gradients:
+            continue
         for path in collection.get_paths():
             patch = PathPatch(path, facecolor="none", edgecolor="none", transform=ax.transData)
             patch.set_zorder(collection.get_zorder() + 0.01)
@@ -291,6 +409,27 @@ def _patch_vertices_in_data(patch: Any) -> np.ndarray | None:
     return vertices
 
 
+def _gradient_cmap(base_color: str, orientation: str) -> Any:
+    key = (base_color, orientation)
+    cmap = _GRADIENT_CMAPS.get(key)
+    if cmap is not None:
+        return cmap
+    if orientation == "horizontal":
+        start = _blend_colors(base_color, _TEXT_COLOR, 0.85)
+        end = _blend_colors(base_color, _BACKGROUND_COLOR, 0.85)
+    else:
+        # origin is "lower", so the first row maps to the bottom of the shape;
+        # fade bottom into the panel while keeping the top vibrant.
+        start = _blend_colors(base_color, _BACKGROUND_COLOR, 0.9)
+        end = _blend_colors(base_color, _TEXT_COLOR, 0.6)
+    cmap = mcolors.LinearSegmentedColormap.from_list(
+        f"{base_color}-{orientation}",
+        [start, end],
+    )
+    _GRADIENT_CMAPS[key] = cmap
+    return cmap
+
+
 def _add_gradient_to_patch(
     ax: Any,
     patch: Any,
@@ -311,22 +450,8 @@ def _add_gradient_to_patch(
     if x0 == x1 or y0 == y1:
         return
 
-    gradient = np.linspace(0, 1, 256)
-    if orientation == "horizontal":
-        data = gradient.reshape(1, -1)
-        start = _blend_colors(base_color, _TEXT_COLOR, 0.85)
-        end = _blend_colors(base_color, _BACKGROUND_COLOR, 0.85)
-    else:
-        data = gradient.reshape(-1, 1)
-        # origin is "lower", so the first row maps to the bottom of the shape;
-        # fade bottom into the panel while keeping the top vibrant.
-        start = _blend_colors(base_color, _BACKGROUND_COLOR, 0.9)
-        end = _blend_colors(base_color, _TEXT_COLOR, 0.6)
-
-    cmap = mcolors.LinearSegmentedColormap.from_list(
-        f"{base_color}-{orientation}",
-        [start, end],
-    )
+    data = _HGRAD if orientation == "horizontal" else _VGRAD
+    cmap = _gradient_cmap(base_color, orientation)
     zorder = patch.get_zorder() + (0.01 if layer == "above" else -0.01)
     ax.imshow(
         data,
@@ -347,6 +472,7 @@ def _add_line_shading(
     times: list[datetime],
     values: list[float],
     color: str,
+    gradient: bool = True,
 ) -> None:
     baseline = [0.0] * len(times)
     base_color = _blend_colors(color, _BACKGROUND_COLOR, 0.45)
@@ -360,7 +486,8 @@ def _add_line_shading(
         label="_nolegend_",
         zorder=1,
     )
-    if PathPatch is None:
+    fill.set_rasterized(True)
+    if PathPatch is None or not gradient:
         return
     for path in fill.get_paths():
         patch = PathPatch(path, facecolor="none", edgecolor="none")
@@ -399,8 +526,8 @@ def _bar_palette(base_color: str, count: int) -> list[Any]:
     if count == 1:
         return [base_color]
     try:
-        base_rgb = mcolors.to_rgb(base_color)
-        panel_rgb = mcolors.to_rgb(_PANEL_COLOR)
+        base_rgb = _to_rgb_cached(base_color)
+        panel_rgb = _to_rgb_cached(_PANEL_COLOR)
     except ValueError:
         return _palette(count)
     shades: list[str] = []
@@ -428,9 +555,14 @@ def _require_matplotlib() -> None:
 
 
 def _endpoint_label(labels: dict[str, str]) -> str:
-    host = labels.get("host", "")
-    path = labels.get("path", "/") or "/"
-    method = labels.get("method", "GET")
+    return _format_endpoint_label(
+        labels.get("method", "GET"), labels.get("host", ""), labels.get("path", "/") or "/"
+    )
+
+
+# Events repeat a small set of endpoints; bounded so distinct URLs cannot grow it
+@lru_cache(maxsize=1024)
+def _format_endpoint_label(method: str, host: str, path: str) -> str:
     return f"{method} {host}{path}"
 
 
@@ -438,51 +570,186 @@ def _http_events(snapshot: Snapshot) -> list[dict[str, Any]]:
     return snapshot.get("events", {}).get("http_request", [])
 
 
-def _bin_timestamp(timestamp: float, bin_seconds: float) -> float:
-    return math.floor(timestamp / bin_seconds) * bin_seconds
-
-
-def _percentile(values: list[float], quantile: float) -> float:
-    if not values:
-        return 0.0
-    if len(values) == 1:
-        return values[0]
-    index = quantile * (len(values) - 1)
-    lower = math.floor(index)
-    upper = math.ceil(index)
-    if lower == upper:
-        return values[int(index)]
-    lower_value = values[lower]
-    upper_value = values[upper]
-    fraction = index - lower
-    return lower_value + (upper_value - lower_value) * fraction
+def _require_numpy() -> None:
+    if np is None:  # pragma: no cover - depends on optional extra
+        raise RuntimeError(
+            "numpy is required for graph generation. "
+            "Install via `pip install ironswarm[graphs]`."
+        )
 
 
-def _latency_timeseries(events: list[dict[str, Any]], bin_seconds: float) -> list[dict[str, Any]]:
-    buckets: dict[float, list[float]] = defaultdict(list)
+@dataclass
+class EventArrays:
+    # Column-per-field view of the HTTP events; label_id indexes into labels.
+    timestamp: np.ndarray
+    duration: np.ndarray
+    status: np.ndarray
+    label_id: np.ndarray
+    labels: list[str]
+
+
+def _extract_event_arrays(events: Iterable[dict[str, Any]]) -> EventArrays:
+    _require_numpy()
+    timestamps: list[float] = []
+    durations: list[float] = []
+    statuses: list[int] = []
+    label_ids: list[int] = []
+    label_index: dict[str, int] = {}
+    nan = float("nan")
     for event in events:
-        timestamp = event.get("timestamp")
-        duration = event.get("duration")
-        if timestamp is None or duration is None:
+        get = event.get
+        timestamp = get("timestamp")
+        if timestamp is None:
             continue
-        bucket = _bin_timestamp(timestamp, bin_seconds)
-        buckets[bucket].append(duration)
+        duration = get("duration")
+        event_labels = get("labels", {})
+        timestamps.append(timestamp)
+        durations.append(nan if duration is None else duration)
+        statuses.append(int(event_labels.get("status", 0)))
+        label_ids.append(
+            label_index.setdefault(_endpoint_label(event_labels), len(label_index))
+        )
+    return EventArrays(
+        timestamp=np.array(timestamps, dtype=np.float64),
+        duration=np.array(durations, dtype=np.float64),
+        status=np.array(statuses, dtype=np.int16),
+        label_id=np.array(label_ids, dtype=np.int32),
+        labels=list(label_index),
+    )
 
-    timeseries: list[dict[str, Any]] = []
-    for bucket in sorted(buckets.keys()):
-        durations = sorted(buckets[bucket])
-        timeseries.append(
-            {
-                "time": bucket,
-                "p50": _percentile(durations, 0.5),
-                "p95": _percentile(durations, 0.95),
-                "p99": _percentile(durations, 0.99),
-            }
+
+def _load_event_arrays(source: str | Path) -> EventArrays:
+    source_path = Path(source)
+    if ijson is None or not source_path.is_file():
+        return _extract_event_arrays(_http_events(_load_snapshot_source(source_path)))
+    # Graphs only need the HTTP events, so stream them straight out of the file
+    # instead of materialising the whole snapshot.
+    try:
+        with open(source_path, "rb") as f:
+            return _extract_event_arrays(
+                ijson.items(f, "events.http_request.item", use_float=True)
+            )
+    except ijson.JSONError:
+        # ijson rejects the Infinity/NaN literals json.dump may emit.
+        return _extract_event_arrays(_http_events(load_snapshot(source_path)))
+
+
+def _time_bins(events: EventArrays, bin_seconds: float) -> TimeBins:
+    # (sorted bin numbers, dense per-event index into them); computed once and
+    # shared by every graph.
+    return np.unique(
+        np.floor(events.timestamp * (1.0 / bin_seconds)).astype(np.int64),
+        return_inverse=True,
+    )
+
+
+def _bucket_quantiles(
+    bins: np.ndarray, durations: np.ndarray, quantiles: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # Inputs are sorted by (bin, duration). Every bucket's quantiles are gathered in
+    # one pass, matching np.quantile(..., method="linear") per bucket.
+    unique_bins, starts, counts = np.unique(bins, return_index=True, return_counts=True)
+    positions = np.multiply.outer(counts - 1, quantiles)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    offsets = starts[:, None]
+    lower_values = durations[offsets + lower]
+    upper_values = durations[offsets + upper]
+    return unique_bins, lower_values + (upper_values - lower_values) * (positions - lower)
+
+
+def _bucket_quantiles_partitioned(
+    bins: np.ndarray, durations: np.ndarray, quantiles: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # Inputs are grouped by bin only. Each bucket selects just the order statistics
+    # the interpolation needs (np.partition is linear) instead of being sorted.
+    unique_bins, starts, counts = np.unique(bins, return_index=True, return_counts=True)
+    positions = np.multiply.outer(counts - 1, quantiles)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    lower_values = np.empty_like(positions)
+    upper_values = np.empty_like(positions)
+    for i, (start, count) in enumerate(zip(starts.tolist(), counts.tolist())):
+        selected = np.partition(
+            durations[start : start + count], np.union1d(lower[i], upper[i])
+        )
+        lower_values[i] = selected[lower[i]]
+        upper_values[i] = selected[upper[i]]
+    return unique_bins, lower_values + (upper_values - lower_values) * (positions - lower)
+
+
+def _bucket_quantiles_kernel(
+    bins: np.ndarray, durations: np.ndarray, quantiles: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # Inputs are sorted by (bin, duration); interpolation matches _bucket_quantiles.
+    n = bins.shape[0]
+    out_bins = np.empty(n, dtype=np.int64)
+    out = np.empty((n, quantiles.shape[0]), dtype=np.float64)
+    groups = 0
+    start = 0
+    while start < n:
+        stop = start + 1
+        while stop < n and bins[stop] == bins[start]:
+            stop += 1
+        last = stop - start - 1
+        for qi in range(quantiles.shape[0]):
+            index = quantiles[qi] * last
+            lower = int(math.floor(index))
+            upper = int(math.ceil(index))
+            lower_value = durations[start + lower]
+            upper_value = durations[start + upper]
+            out[groups, qi] = lower_value + (upper_value - lower_value) * (index - lower)
+        out_bins[groups] = bins[start]
+        groups += 1
+        start = stop
+    return out_bins[:groups], out[:groups]
+
+
+_HAS_NUMBA = njit is not None and np is not None
+if _HAS_NUMBA:  # pragma: no cover - depends on optional accelerator
+    _bucket_quantiles_kernel = njit(cache=True)(_bucket_quantiles_kernel)
+
+
+def _latency_timeseries(
+    events: EventArrays,
+    bin_seconds: float,
+    time_bins: TimeBins | None = None,
+) -> list[dict[str, Any]]:
+    if not len(events.timestamp):
+        return []
+    bin_values, bin_ids = time_bins if time_bins is not None else _time_bins(events, bin_seconds)
+    durations = events.duration
+    present = ~np.isnan(durations)
+    if not present.all():
+        bin_ids = bin_ids[present]
+        durations = durations[present]
+    if not len(bin_ids):
+        return []
+    wanted = np.array([0.5, 0.95, 0.99])
+    if len(bin_ids) >= _PARTITION_MIN_BUCKET * len(bin_values):
+        order = np.argsort(bin_ids, kind="stable")
+        ids, quantiles = _bucket_quantiles_partitioned(
+            bin_ids[order], durations[order], wanted
         )
-    return timeseries
+    else:
+        order = np.lexsort((durations, bin_ids))
+        bucket_quantiles = _bucket_quantiles_kernel if _HAS_NUMBA else _bucket_quantiles
+        ids, quantiles = bucket_quantiles(bin_ids[order], durations[order], wanted)
+    unique_bins = bin_values[ids]
+    return [
+        {
+            "time": float(bucket) * bin_seconds,
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+        }
+        for bucket, (p50, p95, p99) in zip(unique_bins.tolist(), quantiles.tolist())
+    ]
 
 
-def _plot_latency_timeseries(series: list[dict[str, Any]], output: Path) -> None:
+def _plot_latency_timeseries(
+    series: list[dict[str, Any]], output: Path, *, dpi: int = _DEFAULT_DPI
+) -> None:
     _require_matplotlib()
     if not series:
         return
@@ -511,6 +778,8 @@ def _plot_latency_timeseries(series: list[dict[str, Any]], output: Path) -> None
         labels=legend_labels,
         alpha=0.9,
     )
+    for collection in collections:
+        collection.set_rasterized(True)
     _enhance_stackplot(ax, collections, colors)
     ax.set_ylabel("Latency (ms)")
     ax.set_xlabel("Time")
@@ -530,48 +799,59 @@ def _plot_latency_timeseries(series: list[dict[str, Any]], output: Path) -> None
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
     _apply_background_gradient(ax)
     fig.autofmt_xdate()
-    fig.tight_layout()
-    fig.savefig(output, dpi=150)
-    plt.close(fig)
+    fig.savefig(output, dpi=dpi)
 
 
 def _stacked_series_data(
-    events: list[dict[str, Any]],
+    events: EventArrays,
     bin_seconds: float,
     limit: int,
-    predicate: Callable[[dict[str, Any]], bool] | None = None,
+    time_bins: TimeBins | None = None,
+    mask: np.ndarray | None = None,
 ) -> tuple[list[datetime], list[str], list[list[float]]]:
-    buckets: dict[float, dict[str, float]] = defaultdict(lambda: defaultdict(float))
-    totals: Counter[str] = Counter()
-
-    for event in events:
-        if predicate and not predicate(event):
-            continue
-        timestamp = event.get("timestamp")
-        if timestamp is None:
-            continue
-        labels = event.get("labels", {})
-        label = _endpoint_label(labels)
-        bucket = _bin_timestamp(timestamp, bin_seconds)
-        buckets[bucket][label] += 1
-        totals[label] += 1
-
-    if not buckets:
+    if not len(events.timestamp):
         return ([], [], [])
 
-    top_labels = [label for label, _ in totals.most_common(limit)]
-    times = sorted(buckets.keys())
-    datetime_axis = [datetime.fromtimestamp(ts) for ts in times]
-
-    series: list[list[float]] = []
-    for label in top_labels:
-        counts = []
-        for ts in times:
-            value = buckets[ts].get(label, 0.0)
-            counts.append(value / bin_seconds)
-        series.append(counts)
-
-    return (datetime_axis, top_labels, series)
+    inv = 1.0 / bin_seconds
+    unique_bins, bin_ids = time_bins if time_bins is not None else _time_bins(events, bin_seconds)
+    label_ids = events.label_id
+    if mask is not None:
+        bin_ids = bin_ids[mask]
+        label_ids = label_ids[mask]
+        if not len(bin_ids):
+            return ([], [], [])
+    n_bins = len(unique_bins)
+    n_labels = len(events.labels)
+    # Unique rank per label: higher totals first, ties to the label seen first.
+    # Partitioning keeps top-K selection linear; only the K winners get sorted.
+    totals = np.bincount(label_ids, minlength=n_labels)
+    rank = np.arange(n_labels) - totals * n_labels
+    top_ids = np.arange(n_labels)
+    if 0 < limit < n_labels:
+        top_ids = np.argpartition(rank, limit - 1)[:limit]
+    top_ids = top_ids[np.argsort(rank[top_ids])][:limit]
+    # Labels from the shared table may not occur under the mask.
+    top_ids = top_ids[totals[top_ids] > 0]
+
+    # Only the winners get a (bins x labels) matrix; every other label is dropped.
+    n_top = len(top_ids)
+    slots = np.full(n_labels, -1, dtype=np.int64)
+    slots[top_ids] = np.arange(n_top)
+    event_slots = slots[label_ids]
+    keep = event_slots >= 0
+    counts = np.bincount(
+        bin_ids[keep] * n_top + event_slots[keep],
+        minlength=n_bins * n_top,
+    ).reshape(n_bins, n_top)
+    if mask is not None:
+        # Only plot the time buckets the masked events fall into.
+        occupied = np.bincount(bin_ids, minlength=n_bins) > 0
+        counts = counts[occupied]
+        unique_bins = unique_bins[occupied]
+
+    datetime_axis = [datetime.fromtimestamp(b * bin_seconds) for b in unique_bins.tolist()]
+    series = [(counts[:, slot] * inv).tolist() for slot in range(n_top)]
+    return (datetime_axis, [events.labels[idx] for idx in top_ids.tolist()], series)
 
 
 def _series_averages(series: list[list[float]]) -> list[float]:
@@ -591,6 +871,7 @@ def _plot_stack(
     *,
     legend_title: str | None = "Endpoints",
     averages: list[float] | None = None,
+    dpi: int = _DEFAULT_DPI,
 ) -> None:
     _require_matplotlib()
     if not times or not labels:
@@ -604,6 +885,8 @@ def _plot_stack(
             for label, avg in zip(labels, averages)
         ]
     collections = ax.stackplot(times, *series, labels=legend_labels, colors=palette, alpha=0.9)
+    for collection in collections:
+        collection.set_rasterized(True)
     _enhance_stackplot(ax, collections, palette)
     ax.set_ylabel(ylabel)
     ax.set_xlabel("Time")
@@ -623,9 +906,7 @@ def _plot_stack(
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
     _apply_background_gradient(ax)
     fig.autofmt_xdate()
-    fig.tight_layout()
-    fig.savefig(output, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    fig.savefig(output, dpi=dpi, bbox_inches="tight")
 
 
 def _plot_line_series(
@@ -635,14 +916,17 @@ def _plot_line_series(
     output: Path,
     title: str,
     ylabel: str,
+    *,
+    dpi: int = _DEFAULT_DPI,
 ) -> None:
     _require_matplotlib()
     if not times or not labels:
         return
     fig, ax = _theme_figure((12, 5))
     palette = _palette(len(labels))
+    gradients = _use_gradients(len(labels))
     for label, values, color in zip(labels, series, palette):
-        _add_line_shading(ax, times, values, color)
+        _add_line_shading(ax, times, values, color, gradient=gradients)
         ax.plot(times, values, label=label, color=color, linewidth=2.1)
         ax.scatter(
             times,
@@ -669,9 +953,7 @@ def _plot_line_series(
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
     _apply_background_gradient(ax)
     fig.autofmt_xdate()
-    fig.tight_layout()
-    fig.savefig(output, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    fig.savefig(output, dpi=dpi, bbox_inches="tight")
 
 
 def _counter_samples(snapshot: Snapshot, metric_name: str) -> list[dict[str, Any]]:
@@ -686,22 +968,7 @@ def _collect_counter_series(samples: list[dict[str, Any]], limit: int) -> list[t
     for sample in samples:
         label = _endpoint_label(sample.get("labels", {}))
         aggregated[label] = aggregated.get(label, 0.0) + float(sample.get("value", 0))
-    sorted_items = sorted(aggregated.items(), key=lambda kv: kv[1], reverse=True)
-    return sorted_items[:limit]
-
-
-def _percentile_from_buckets(
-    buckets: list[dict[str, Any]], percentile: float, total_count: int
-) -> float:
-    if total_count == 0:
-        return 0.0
-    threshold = total_count * percentile
-    for bucket in buckets:
-        boundary = bucket.get("le")
-        boundary_value = float("inf") if boundary == "+Inf" else float(boundary)
-        if bucket.get("count", 0) >= threshold:
-            return boundary_value
-    return float("inf")
+    return heapq.nlargest(limit, aggregated.items(), key=itemgetter(1))
 
 
 def _latency_stats(snapshot: Snapshot, limit: int) -> list[dict[str, Any]]:
@@ -710,21 +977,36 @@ def _latency_stats(snapshot: Snapshot, limit: int) -> list[dict[str, Any]]:
     )
     if not histogram:
         return []
+    _require_numpy()
 
+    quantiles = np.array([0.5, 0.95, 0.99])
+    # Samples in one snapshot nearly always share a bucket layout.
+    boundary_cache: dict[tuple[Any, ...], np.ndarray] = {}
     stats: list[dict[str, Any]] = []
     for sample in histogram.get("samples", []):
         count = sample.get("count", 0)
         if not count:
             continue
         buckets = sample.get("buckets", [])
+        layout = tuple(b.get("le") for b in buckets)
+        boundaries = boundary_cache.get(layout)
+        if boundaries is None:
+            # Bucket counts are cumulative, so the first bucket reaching each
+            # threshold holds that quantile; the trailing inf covers a short tail.
+            boundaries = np.array(
+                [float("inf") if le == "+Inf" else float(le) for le in layout] + [float("inf")]
+            )
+            boundary_cache[layout] = boundaries
+        cumulative = np.array([b.get("count", 0) for b in buckets], dtype=np.float64)
+        p50, p95, p99 = boundaries[np.searchsorted(cumulative, count * quantiles)].tolist()
         stats.append(
             {
                 "label": _endpoint_label(sample.get("labels", {})),
                 "count": count,
                 "avg": sample.get("sum", 0.0) / count,
-                "p50": _percentile_from_buckets(buckets, 0.5, count),
-                "p95": _percentile_from_buckets(buckets, 0.95, count),
-                "p99": _percentile_from_buckets(buckets, 0.99, count),
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
             }
         )
 
@@ -732,7 +1014,9 @@ def _latency_stats(snapshot: Snapshot, limit: int) -> list[dict[str, Any]]:
     return stats[:limit]
 
 
-def _plot_latency(stats: list[dict[str, Any]], output: Path) -> None:
+def _plot_latency(
+    stats: list[dict[str, Any]], output: Path, *, dpi: int = _DEFAULT_DPI
+) -> None:
     _require_matplotlib()
     if not stats:
         return
@@ -769,9 +1053,7 @@ def _plot_latency(stats: list[dict[str, Any]], output: Path) -> None:
         ha="center",
     )
     _apply_background_gradient(ax)
-    fig.tight_layout()
-    fig.savefig(output, dpi=150)
-    plt.close(fig)
+    fig.savefig(output, dpi=dpi)
 
 
 def _plot_bar(
@@ -780,6 +1062,8 @@ def _plot_bar(
     title: str,
     ylabel: str,
     color: str,
+    *,
+    dpi: int = _DEFAULT_DPI,
 ) -> None:
     _require_matplotlib()
     if not data:
@@ -798,10 +1082,12 @@ def _plot_bar(
     ax.set_title(title, loc="left", pad=18)
     ax.set_xlim(left=0)
     ax.margins(y=0.02)
+    gradients = _use_gradients(len(bars))
     for bar, color in zip(bars, palette):
         bar.set_facecolor(_blend_colors(color, _BACKGROUND_COLOR, 0.35))
         bar.set_alpha(0.65)
-        _add_gradient_to_patch(ax, bar, color, orientation="horizontal")
+        if gradients:
+            _add_gradient_to_patch(ax, bar, color, orientation="horizontal")
     if hasattr(ax, "bar_label"):
         ax.bar_label(
             bars,
@@ -811,9 +1097,7 @@ def _plot_bar(
             fontsize=10,
         )
     _apply_background_gradient(ax)
-    fig.tight_layout()
-    fig.savefig(output, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    fig.savefig(output, dpi=dpi)
 
 
 def generate_graphs(
@@ -821,65 +1105,120 @@ def generate_graphs(
     output_dir: str | Path,
     limit: int = 10,
     bin_seconds: float = 1.0,
+    image_format: str = "png",
+    dpi: int = _DEFAULT_DPI,
+    workers: int = 1,
 ) -> list[Path]:
-    _require_matplotlib()
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    generated: list[Path] = []
+    raw_events = _http_events(snapshot)
+    if not raw_events:
+        raise RuntimeError(_MISSING_EVENTS_MESSAGE)
+    try:
+        return _generate_event_graphs(
+            _extract_event_arrays(raw_events),
+            output_dir,
+            limit=limit,
+            bin_seconds=bin_seconds,
+            image_format=image_format,
+            dpi=dpi,
+            workers=workers,
+        )
+    finally:
+        _close_cached_figures()
 
-    events = _http_events(snapshot)
-    if events:
-        latency_series = _latency_timeseries(events, bin_seconds)
-        if latency_series:
-            path = output_path / "latency.png"
-            _plot_latency_timeseries(latency_series, path)
-            generated.append(path)
 
-        throughput_times, throughput_labels, throughput_series = _stacked_series_data(
-            events,
-            bin_seconds,
-            limit,
+def _generate_event_graphs(
+    events: EventArrays,
+    output_dir: str | Path,
+    limit: int = 10,
+    bin_seconds: float = 1.0,
+    image_format: str = "png",
+    dpi: int = _DEFAULT_DPI,
+    workers: int = 1,
+) -> list[Path]:
+    _require_matplotlib()
+    if not len(events.timestamp):
+        raise RuntimeError(_MISSING_EVENTS_MESSAGE)
+    if image_format not in _IMAGE_FORMATS:
+        raise ValueError(
+            f"Unsupported image format {image_format!r}; "
+            f"expected one of {', '.join(_IMAGE_FORMATS)}"
         )
-        if throughput_times and throughput_labels:
-            path = output_path / "throughput.png"
-            _plot_stack(
-                throughput_times,
-                throughput_labels,
-                throughput_series,
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    jobs: list[tuple[Path, Callable[[], None]]] = []
+
+    time_bins = _time_bins(events, bin_seconds)
+    latency_series = _latency_timeseries(events, bin_seconds, time_bins)
+    if latency_series:
+        path = output_path / f"latency.{image_format}"
+        jobs.append((path, partial(_plot_latency_timeseries, latency_series, path, dpi=dpi)))
+
+    throughput_times, throughput_labels, throughput_series = _stacked_series_data(
+        events,
+        bin_seconds,
+        limit,
+        time_bins,
+    )
+    if throughput_times and throughput_labels:
+        path = output_path / f"throughput.{image_format}"
+        jobs.append(
+            (
                 path,
-                title="HTTP Throughput (requests/sec)",
-                ylabel="Requests / sec",
-                legend_title="Top endpoints",
-                averages=_series_averages(throughput_series),
+                partial(
+                    _plot_stack,
+                    throughput_times,
+                    throughput_labels,
+                    throughput_series,
+                    path,
+                    title="HTTP Throughput (requests/sec)",
+                    ylabel="Requests / sec",
+                    legend_title="Top endpoints",
+                    averages=_series_averages(throughput_series),
+                    dpi=dpi,
+                ),
             )
-            generated.append(path)
-
-        error_times, error_labels, error_series = _stacked_series_data(
-            events,
-            bin_seconds,
-            limit,
-            predicate=lambda evt: int(evt.get("labels", {}).get("status", 0)) >= 400,
         )
-        if error_times and error_labels:
-            path = output_path / "errors.png"
-            _plot_stack(
-                error_times,
-                error_labels,
-                error_series,
+
+    error_times, error_labels, error_series = _stacked_series_data(
+        events,
+        bin_seconds,
+        limit,
+        time_bins,
+        mask=events.status >= 400,
+    )
+    if error_times and error_labels:
+        path = output_path / f"errors.{image_format}"
+        jobs.append(
+            (
                 path,
-                title="HTTP Errors (per sec)",
-                ylabel="Errors / sec",
-                legend_title="Error endpoints",
-                averages=_series_averages(error_series),
+                partial(
+                    _plot_stack,
+                    error_times,
+                    error_labels,
+                    error_series,
+                    path,
+                    title="HTTP Errors (per sec)",
+                    ylabel="Errors / sec",
+                    legend_title="Error endpoints",
+                    averages=_series_averages(error_series),
+                    dpi=dpi,
+                ),
             )
-            generated.append(path)
+        )
 
-        return generated
-    raise RuntimeError(
-        "Snapshot missing HTTP request events. "
-        "Please re-run your scenario with a newer ironswarm version that records "
-        "per-request events."
-    )
+    _render_jobs([job for _, job in jobs], workers)
+    return [path for path, _ in jobs]
+
+
+def _render_jobs(jobs: list[Callable[[], None]], workers: int) -> None:
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            job()
+        return
+    # Rasterising holds the GIL for most of savefig, so fan out to processes.
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        for future in [pool.submit(job) for job in jobs]:
+            future.result()
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -899,7 +1238,7 @@ def main(argv: Sequence[str] | None = None) -> int:
         "-o",
         "--output-dir",
         default="metrics_graphs",
-        help="Directory to write PNG graphs (default: metrics_graphs)",
+        help="Directory to write graphs (default: metrics_graphs)",
     )
     parser.add_argument(
         "-n",
@@ -914,18 +1253,43 @@ def main(argv: Sequence[str] | None = None) -> int:
         default=1.0,
         help="Time bucket size in seconds for throughput/latency graphs (default: 1.0)",
     )
+    parser.add_argument(
+        "--format",
+        choices=_IMAGE_FORMATS,
+        default="png",
+        help="Image format for generated graphs (default: png)",
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=_DEFAULT_DPI,
+        help=f"Resolution for raster formats (default: {_DEFAULT_DPI})",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=min(3, os.cpu_count() or 1),
+        help="Worker processes used to render graphs; 1 renders serially"
+        " (default: one per graph, capped at the CPU count)",
+    )
 
     args = parser.parse_args(argv)
-    snapshot = _load_snapshot_source(args.snapshot)
+    events = _load_event_arrays(args.snapshot)
     try:
-        files = generate_graphs(
-            snapshot,
+        files = _generate_event_graphs(
+            events,
             args.output_dir,
             limit=args.limit,
             bin_seconds=args.bin_size,
+            image_format=args.format,
+            dpi=args.dpi,
+            workers=args.jobs,
         )
     except RuntimeError as exc:
         parser.exit(f"{exc}\n")
+    finally:
+        _close_cached_figures()
     for file in files:
         print(f"Generated {file}")
     return 0
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import argparse
-import json
+import heapq
 from collections.abc import Sequence
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
+from ironswarm.metrics_snapshot import loads_snapshot_data
+
 Snapshot = dict[str, Any]
 
 
@@ -17,20 +20,24 @@ def _counter_total(snapshot: Snapshot, metric_name: str) -> float:
 
 
 def _group_counter_samples(
-    snapshot: Snapshot, metric_name: str, keys: Sequence[str]
+    snapshot: Snapshot,
+    metric_name: str,
+    keys: Sequence[str],
+    limit: int | None = None,
 ) -> list[tuple[float, dict[str, str]]]:
     metric = snapshot.get("counters", {}).get(metric_name)
     if not metric:
         return []
     totals: dict[tuple[str, ...], float] = {}
-    label_cache: dict[tuple[str, ...], dict[str, str]] = {}
     for sample in metric.get("samples", []):
         labels = sample.get("labels", {})
         key = tuple(labels.get(k, "unknown") for k in keys)
         totals[key] = totals.get(key, 0.0) + float(sample.get("value", 0))
-        label_cache[key] = {k: labels.get(k, "unknown") for k in keys}
-    sorted_totals = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
-    return [(value, label_cache[key]) for key, value in sorted_totals]
+    if limit is None:
+        top = sorted(totals.items(), key=itemgetter(1), reverse=True)
+    else:
+        top = heapq.nlargest(limit, totals.items(), key=itemgetter(1))
+    return [(value, dict(zip(keys, key))) for key, value in top]
 
 
 def _histogram_samples(snapshot: Snapshot, metric_name: str) -> list[dict[str, Any]]:
@@ -61,11 +68,14 @@ def summarize_snapshot(snapshot: Snapshot, limit: int = 5) -> list[str]:
             f"{int(journey_failures)} failures ({failure_rate:.1f}% fail)"
         )
         top_journeys = _group_counter_samples(
-            snapshot, "ironswarm_journey_executions_total", ("scenario", "journey")
+            snapshot,
+            "ironswarm_journey_executions_total",
+            ("scenario", "journey"),
+            limit=limit,
         )
         if top_journeys:
             lines.append("Top journeys:")
-            for value, labels in top_journeys[:limit]:
+            for value, labels in top_journeys:
                 lines.append(
                     f"  - {labels['scenario']}/{labels['journey']}: {int(value)} runs"
                 )
@@ -82,10 +92,11 @@ def summarize_snapshot(snapshot: Snapshot, limit: int = 5) -> list[str]:
             snapshot,
             "ironswarm_http_requests_total",
             ("method", "host", "path"),
+            limit=limit,
         )
         if top_http:
             lines.append("Top HTTP targets:")
-            for value, labels in top_http[:limit]:
+            for value, labels in top_http:
                 host = labels.get("host", "")
                 path = labels.get("path", "/")
                 lines.append(
@@ -126,8 +137,7 @@ def format_report(snapshot: Snapshot, limit: int = 5) -> str:
 
 
 def load_snapshot(path: str | Path) -> Snapshot:
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    return loads_snapshot_data(Path(path).read_bytes())
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -5,12 +5,112 @@ Represents a single node's metrics snapshot at a specific timestamp,
 designed to be shared across the cluster via gossip protocol.
 """
 
-from dataclasses import dataclass
+import gzip
+import json
+import mmap
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
 from time import time
 from typing import Any
 
+try:  # pragma: no cover - optional speedup
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
-@dataclass(frozen=True)
+
+def dumps_snapshot_data(snapshot_data: dict[str, Any]) -> str:
+    """Encode snapshot data as compact JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(snapshot_data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(snapshot_data)
+
+
+def loads_snapshot_data(snapshot_json: str | bytes) -> dict[str, Any]:
+    """Decode snapshot JSON, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(snapshot_json)
+        except orjson.JSONDecodeError:
+            # json.dump(s) writes Infinity/NaN literals, which orjson rejects.
+            pass
+    return json.loads(snapshot_json)
+
+
+# Snapshot logs: one append-only file per node directory and hour. Each record is
+# a little-endian (payload length, snapshot timestamp) header then gzip'd JSON.
+SNAPSHOT_LOG_ROTATE_SECONDS = 3600
+_RECORD_HEADER = struct.Struct("<IQ")
+
+
+def snapshot_log_path(node_dir: Path, timestamp: int) -> Path:
+    """Return the hourly log file that holds the snapshot taken at `timestamp`."""
+    hour = timestamp - timestamp % SNAPSHOT_LOG_ROTATE_SECONDS
+    return node_dir / f"metrics_{hour}.log"
+
+
+def append_snapshot_record(path: Path, timestamp: int, snapshot_json: str) -> None:
+    """
+    Append one encoded snapshot to a snapshot log.
+
+    A partial record left by a writer that died mid-append is truncated away
+    first, so it cannot hide the records written after it.
+    """
+    payload = gzip.compress(snapshot_json.encode("utf-8"), compresslevel=1)
+    with open(path, "a+b") as f:
+        size = f.seek(0, 2)
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                intact = _intact_length(data)
+            if intact < size:
+                f.truncate(intact)
+        # One write per record so a record is never split across appends
+        f.write(_RECORD_HEADER.pack(len(payload), timestamp) + payload)
+
+
+def _intact_length(data: mmap.mmap) -> int:
+    # Byte length of the complete records at the start of a snapshot log
+    offset = 0
+    end = len(data)
+    while end - offset >= _RECORD_HEADER.size:
+        length, _ = _RECORD_HEADER.unpack_from(data, offset)
+        if end - offset - _RECORD_HEADER.size < length:
+            break
+        offset += _RECORD_HEADER.size + length
+    return offset
+
+
+def iter_snapshot_records(path: str | Path, min_timestamp: int = 0) -> Iterator[tuple[int, str]]:
+    """
+    Yield (timestamp, snapshot_json) for records at or after `min_timestamp`.
+
+    Older records are skipped by header without being decompressed.
+
+    Raises:
+        ValueError: After the intact records, if the log ends in a partial record
+    """
+    with open(path, "rb") as f:
+        if not f.seek(0, 2):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = 0
+            end = len(data)
+            while offset < end:
+                if end - offset < _RECORD_HEADER.size:
+                    raise ValueError(f"truncated record header at byte {offset}")
+                length, timestamp = _RECORD_HEADER.unpack_from(data, offset)
+                offset += _RECORD_HEADER.size
+                if end - offset < length:
+                    raise ValueError(f"truncated record at byte {offset}")
+                if timestamp >= min_timestamp:
+                    payload = gzip.decompress(data[offset:offset + length])
+                    yield timestamp, payload.decode("utf-8")
+                offset += length
+
+
+@dataclass(frozen=True, slots=True)
 class MetricsSnapshot:
     """
     Immutable metrics snapshot from a single node at a specific time.
@@ -24,10 +124,16 @@ class MetricsSnapshot:
     node_identity: str
     timestamp: int
     snapshot_data: dict[str, Any]
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Snapshots are hashed on every gossip set/dict lookup; the key fields are
+        # frozen, so compute the hash once.
+        object.__setattr__(self, "_hash", hash((self.node_identity, self.timestamp)))
 
     def __hash__(self) -> int:
         """Hash based on node identity and timestamp - naturally unique."""
-        return hash((self.node_identity, self.timestamp))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         """Equality based on node identity and timestamp."""
@@ -48,7 +154,7 @@ class MetricsSnapshot:
 
     def is_expired(self, ttl_seconds: int) -> bool:
         """Check if snapshot has exceeded its time-to-live."""
-        return self.age_seconds() > ttl_seconds
+        return time() - self.timestamp > ttl_seconds
 
     def to_dict(self) -> dict[str, Any]:
         """
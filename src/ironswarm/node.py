@@ -1,20 +1,38 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import json
 import logging
+import os
 import random
 import uuid
-from datetime import datetime
+import weakref
+import zlib
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from math import ceil, log2
+from operator import itemgetter
 from pathlib import Path
-from time import time
+from time import time, time_ns
 from typing import Any, Literal
 
 from ironswarm.helper import ip_address
 from ironswarm.lwwelementset import LWWElementSet
 from ironswarm.metrics.collector import collector
-from ironswarm.metrics_snapshot import MetricsSnapshot
+from ironswarm.metrics_snapshot import (
+    SNAPSHOT_LOG_ROTATE_SECONDS,
+    MetricsSnapshot,
+    append_snapshot_record,
+    dumps_snapshot_data,
+    iter_snapshot_records,
+    loads_snapshot_data,
+    snapshot_log_path,
+)
 from ironswarm.scheduler import Scheduler
+from ironswarm.serialization import MAX_STRING_LENGTH
 from ironswarm.transport import Transport
 from ironswarm.transport.zmq import ZMQTransport
 from ironswarm.web import WebServer
@@ -23,6 +41,36 @@ log = logging.getLogger(__name__)
 
 
 class Node:
+    # Fixed attribute layout: no per-instance __dict__, faster lookups on the
+    # per-tick paths (count/index/stats/gossip). New attributes go here too.
+    __slots__ = (
+        "identity",
+        "_index",
+        "_sorted_nodes",
+        "state",
+        "output_stats",
+        "running",
+        "scheduler",
+        "metrics_retention_seconds",
+        "metrics_gossip_window_seconds",
+        "metrics_snapshot_ttl_seconds",
+        "metrics_dir",
+        "_shared_fs_peers",
+        "_peer_scan",
+        "_persisted_snapshot_keys",
+        "_snapshot_cache",
+        "_snapshot_index",
+        "_snapshot_seq",
+        "_io_pool",
+        "scenarios_dir",
+        "transport",
+        "_stats_prefix",
+        "_gossip_trigger",
+        "bootstrap_nodes",
+        "web_server",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         host: Literal["public", "local"] | str = "public",
@@ -39,13 +87,19 @@ class Node:
         metrics_snapshot_ttl_minutes: int = 120,
     ) -> None:
         self.identity: str = uuid.uuid4().hex
-        self._index: int | None = None
-        self._count: int | None = None
-        self._cached_node_keys: set[str] | None = None  # Cache for invalidation detection
+        self._index: int | None = None  # maintained by _on_register_change
+        self._sorted_nodes: list[str] = []  # live node_register keys, kept sorted
         self.state: dict[str, LWWElementSet] = {}
         self.state["node_register"] = LWWElementSet()
         self.state["scenarios"] = LWWElementSet()
         self.state["metrics_snapshots"] = LWWElementSet()
+        # Set whenever the register or scenarios change so gossip goes out at once
+        self._gossip_trigger: asyncio.Event = asyncio.Event()
+        # The hooks must not reference the node strongly: a node <-> state cycle
+        # leaves the ZMQ context to the cycle collector, where term() can block.
+        gossip_trigger = self._gossip_trigger
+        self.state["node_register"].on_change = _weak_callback(self._on_register_change)
+        self.state["scenarios"].on_change = lambda _element: gossip_trigger.set()
         self.output_stats: bool = output_stats
         self.running: bool = True
 
@@ -59,6 +113,20 @@ class Node:
         # Metrics directory setup
         self.metrics_dir: Path = Path(metrics_dir) / self.identity
         self._shared_fs_peers: set[str] = set()  # Peers on same filesystem (detected at bind)
+        # (metrics base mtime, peers) from the last settled filesystem scan
+        self._peer_scan: tuple[int, frozenset[str]] | None = None
+        # metrics_snapshots keys known to be on disk, so they are never re-decoded
+        self._persisted_snapshot_keys: set[Any] = set()
+        # Decoded MetricsSnapshot per metrics_snapshots key
+        self._snapshot_cache: dict[Any, MetricsSnapshot] = {}
+        # Sorted (timestamp, node_identity, seq, key) for cached snapshots; seq
+        # breaks ties so keys themselves are never compared
+        self._snapshot_index: list[tuple[int, str, int, Any]] = []
+        self._snapshot_seq = count()
+
+        # Snapshot encoding and file I/O run here so they never stall gossip;
+        # created on bind, until then the loop's default executor is used
+        self._io_pool: ThreadPoolExecutor | None = None
 
         # Scenarios directory setup
         self.scenarios_dir: Path = Path(scenarios_dir)
@@ -73,6 +141,8 @@ class Node:
         self.transport: Transport = transport or ZMQTransport(
             host, port, identity=self.identity.encode()
         )
+        # identity and port never change, so the stats line prefix is built once
+        self._stats_prefix: str = f"{self.identity[:4]}:{str(self.transport.port)[-2:]}"
 
         self.bootstrap_nodes: list[str] = bootstrap_nodes or []
 
@@ -83,35 +153,43 @@ class Node:
 
         if job:
             self.state["scenarios"].add(
-                job, init_time=datetime.now().timestamp(), scenario=job,
+                job, init_time=time(), scenario=job,
             )
 
-    def _invalidate_cache(self) -> None:
-        """Invalidate cached node index and count when node register changes."""
-        current_keys = self.state["node_register"].keys()
-        if self._cached_node_keys != current_keys:
-            self._cached_node_keys = current_keys.copy()
-            self._index = None
-            self._count = None
+    def _on_register_change(self, element: str) -> None:
+        """Apply one node_register write to the sorted node list and our index.
+
+        Called by the register for every add/remove that changes an entry, so
+        `count` and `index` are plain reads: each join or leave costs a bisect
+        plus a list insert/delete, and nothing is recomputed between writes.
+        """
+        self._gossip_trigger.set()
+
+        ordered = self._sorted_nodes
+        position = bisect_left(ordered, element)
+        listed = position < len(ordered) and ordered[position] == element
+        live = bool(self.state["node_register"].lookup(element))
+        if live == listed:
+            return  # metadata update only
+
+        if live:
+            ordered.insert(position, element)
+        else:
+            del ordered[position]
+
+        if element == self.identity:
+            self._index = position if live else None
+        elif self._index is not None and element < self.identity:
+            self._index += 1 if live else -1
 
     @property
     def count(self) -> int:
-        """Get node count with caching."""
-        self._invalidate_cache()
-        if self._count is None:
-            self._count = len(self._cached_node_keys or set())
-        return self._count
+        """Number of live nodes in the register."""
+        return len(self._sorted_nodes)
 
     @property
     def index(self) -> int | None:
-        """Get node index with caching. O(1) when cache is valid, O(n log n) on invalidation."""
-        self._invalidate_cache()
-        if self._index is None and self._cached_node_keys:
-            # Only sort when cache is invalid
-            ordered = sorted(self._cached_node_keys)
-            self._index = (
-                ordered.index(self.identity) if self.identity in ordered else None
-            )
+        """This node's rank in the sorted register, or None if not registered."""
         return self._index
 
     def _detect_shared_filesystem_peers(self) -> set[str]:
@@ -121,40 +199,57 @@ class Node:
         Nodes on the same filesystem can skip gossiping snapshot JSON and read
         directly from each other's metrics directories.
 
+        Peer directories can only appear or disappear by changing the metrics
+        base directory's mtime, so the directory is only rescanned when that
+        mtime moves.
+
         Returns:
             Set of node identities (str) that share this node's filesystem
         """
         shared_peers = set()
 
         try:
-            # Get our filesystem's device ID
-            my_device = self.metrics_dir.stat().st_dev
             metrics_base = self.metrics_dir.parent
 
             if not metrics_base.exists():
                 return shared_peers
 
-            # Scan for other node directories
-            for node_dir in metrics_base.iterdir():
-                if not node_dir.is_dir():
-                    continue
+            base_mtime = metrics_base.stat().st_mtime_ns
+            if self._peer_scan is not None and self._peer_scan[0] == base_mtime:
+                return set(self._peer_scan[1])
 
-                # Skip our own directory
-                if node_dir.name == self.identity:
-                    continue
+            # Get our filesystem's device ID
+            my_device = self.metrics_dir.stat().st_dev
 
-                try:
-                    # Compare device IDs
-                    peer_device = node_dir.stat().st_dev
-                    if peer_device == my_device:
-                        shared_peers.add(node_dir.name)
-                        log.debug(
-                            f"Detected local filesystem peer: {node_dir.name[:8]}... "
-                            f"(same device {my_device})"
-                        )
-                except (OSError, PermissionError) as e:
-                    log.debug(f"Could not stat {node_dir}: {e}")
-                    continue
+            # Scan for other node directories (scandir avoids a stat per is_dir check)
+            with os.scandir(metrics_base) as entries:
+                for entry in entries:
+                    # Skip our own directory
+                    if entry.name == self.identity:
+                        continue
+
+                    try:
+                        if not entry.is_dir():
+                            continue
+
+                        # Compare device IDs
+                        peer_device = entry.stat().st_dev
+                        if peer_device == my_device:
+                            shared_peers.add(entry.name)
+                            log.debug(
+                                f"Detected local filesystem peer: {entry.name[:8]}... "
+                                f"(same device {my_device})"
+                            )
+                    except (OSError, PermissionError) as e:
+                        log.debug(f"Could not stat {entry.path}: {e}")
+                        continue
+
+            # An mtime within the filesystem's timestamp granularity of now could
+            # still hide a later change, so only cache scans of settled directories.
+            if time_ns() - base_mtime > 2_000_000_000:
+                self._peer_scan = (base_mtime, frozenset(shared_peers))
+            else:
+                self._peer_scan = None
 
         except (OSError, AttributeError) as e:
             log.warning(f"Failed to detect shared filesystem peers: {e}")
@@ -175,13 +270,18 @@ class Node:
         """
         self.transport.bind()
 
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="ironswarm-snapshot-io"
+            )
+
         # Create metrics directory (parent for all nodes)
         self.metrics_dir.parent.mkdir(parents=True, exist_ok=True)
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
         log.info(f"Metrics will be saved to {self.metrics_dir}")
 
         # Load existing snapshots from disk (local + peer)
-        self._load_snapshots_from_disk()
+        await self._load_snapshots_from_disk()
 
         # Detect peers sharing this filesystem (optimization to skip gossiping to them)
         self._shared_fs_peers = self._detect_shared_filesystem_peers()
@@ -203,24 +303,33 @@ class Node:
         """Run main node event loop.
 
         Creates and manages concurrent tasks for transport listening, neighbor updates,
-        and scenario scheduling. Compatible with Python 3.10+ (TaskGroup added in 3.11).
+        and scenario scheduling. Uses a TaskGroup on Python 3.11+ and falls back to
+        gather on 3.10; on 3.11+ a failing loop surfaces as an ExceptionGroup.
         """
         # Start web server if configured
         if self.web_server:
             await self.web_server.start()
 
-        # Create tasks for concurrent execution
-        tasks = [
-            asyncio.create_task(self.transport.listen(state=self.state)),
-            asyncio.create_task(self.update_loop()),
-            asyncio.create_task(self.scheduler.run(self)),
-            asyncio.create_task(self.metrics_save_loop()),
-            asyncio.create_task(self.peer_snapshot_save_loop()),
+        loops = [
+            self.transport.listen(state=self.state),
+            self.update_loop(),
+            self.scheduler.run(self),
+            self.metrics_save_loop(),
+            self.peer_snapshot_save_loop(),
         ]
 
         if self.output_stats:
-            tasks.append(asyncio.create_task(self.stats()))
+            loops.append(self.stats())
+
+        if hasattr(asyncio, "TaskGroup"):
+            # Python 3.11+: a failing loop cancels the others, and cancelling
+            # run() cancels every loop, without manual bookkeeping
+            async with asyncio.TaskGroup() as tg:
+                for coro in loops:
+                    tg.create_task(coro)
+            return
 
+        tasks = [asyncio.create_task(coro) for coro in loops]
         try:
             # Run all tasks concurrently until one fails or all complete
             await asyncio.gather(*tasks)
@@ -232,14 +341,18 @@ class Node:
             raise
 
     async def update_loop(self) -> None:
-        """Periodic update loop for neighbor gossip and filesystem peer detection."""
-        refresh_counter = 0
+        """Gossip loop for neighbor updates and filesystem peer detection.
+
+        Gossips as soon as node_register or scenarios change, and at least
+        every 2s otherwise so anti-entropy still runs when nothing is new.
+        """
+        next_refresh = time() + 60
         while self.running:
+            self._gossip_trigger.clear()
             await self.update_neighbours()
 
             # Periodically refresh shared filesystem peer detection (every ~60s)
-            refresh_counter += 1
-            if refresh_counter >= 30:  # 30 iterations * 2s = 60s
+            if time() >= next_refresh:
                 old_peers = self._shared_fs_peers.copy()
                 self._shared_fs_peers = self._detect_shared_filesystem_peers()
 
@@ -251,20 +364,25 @@ class Node:
                 if removed:
                     log.info(f"Local filesystem peers removed: {[p[:8] + '...' for p in removed]}")
 
-                refresh_counter = 0
+                next_refresh = time() + 60
 
-            await asyncio.sleep(2)
+            try:
+                await asyncio.wait_for(self._gossip_trigger.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                pass
 
     async def stats(self) -> None:
-        """Periodic stats output loop."""
+        """Periodic stats output loop; a line is logged only when a value changed."""
+        last = None
         while self.running:
-            msg = f"{self.identity[:4]}:{str(self.transport.port)[-2:]} Node Count:{self.count} Index:{self.index}"
-            all_spawned_journeys = 0
-            for sc in self.scheduler.scenario_managers:
-                all_spawned_journeys += sc.total_spawned_journeys
-
-            msg += f" Journeys Spawned:{all_spawned_journeys}"
-            log.info(msg)
+            spawned = sum(sc.total_spawned_journeys for sc in self.scheduler.scenario_managers)
+            current = (self.count, self.index, spawned)
+            if current != last:
+                log.info(
+                    f"{self._stats_prefix} Node Count:{current[0]} Index:{current[1]}"
+                    f" Journeys Spawned:{spawned}"
+                )
+                last = current
             await asyncio.sleep(1)
 
     async def metrics_save_loop(self) -> None:
@@ -274,6 +392,9 @@ class Node:
             timestamp = int(time())
             snapshot_data = collector.snapshot(reset=True)
             snapshot_data["node_identity"] = self.identity
+            loop = asyncio.get_running_loop()
+            # The same compact JSON is gossiped and written to disk
+            snapshot_json = await loop.run_in_executor(self._io_pool, dumps_snapshot_data, snapshot_data)
 
             # Create MetricsSnapshot for CRDT
             metrics_snapshot = MetricsSnapshot(
@@ -283,19 +404,24 @@ class Node:
             )
 
             # Add to CRDT state for gossip using string key
-            # Store snapshot data as JSON-serialized metadata
+            # Store snapshot data as JSON-serialized metadata: the wire schema
+            # only admits scalar metadata values, so the dict cannot go in as-is
             snapshot_key = f"{self.identity}:{timestamp}"
             self.state["metrics_snapshots"].add(
                 snapshot_key,
                 timestamp=timestamp,
                 node_identity=self.identity,
-                snapshot_json=json.dumps(snapshot_data),
+                snapshot_json=snapshot_json,
             )
+            # Local readers get the dict we already hold instead of decoding the JSON
+            self._remember_snapshot(snapshot_key, metrics_snapshot)
 
-            # Save to local disk
-            filepath = self.metrics_dir / f"metrics_{timestamp}.json"
+            # Append to this hour's local snapshot log
+            filepath = snapshot_log_path(self.metrics_dir, timestamp)
             try:
-                filepath.write_text(json.dumps(snapshot_data, indent=2), encoding="utf-8")
+                await loop.run_in_executor(
+                    self._io_pool, append_snapshot_record, filepath, timestamp, snapshot_json
+                )
                 log.debug(f"Metrics snapshot saved to {filepath}")
             except Exception as e:
                 log.error(f"Failed to save metrics snapshot: {e}")
@@ -308,25 +434,39 @@ class Node:
         while self.running:
             await asyncio.sleep(60)  # Save peer snapshots every 60 seconds
 
-            # Get all snapshots from CRDT state
+            # Walk raw CRDT entries; only snapshots not yet on disk get decoded
             saved_count = 0
-            snapshots = self._get_snapshots_from_crdt()
+            loop = asyncio.get_running_loop()
+            entries = self.state["metrics_snapshots"].values()
+
+            # Removals merged in from peers never pass through local cleanup
+            live_keys = {key for key, _ in entries}
+            self._persisted_snapshot_keys &= live_keys
+            self._forget_snapshots(self._snapshot_cache.keys() - live_keys)
+
+            for key, metadata in entries:
+                if key in self._persisted_snapshot_keys:
+                    continue
+
+                node_identity = metadata.get("node_identity", "")
 
-            for snapshot in snapshots:
                 # Skip our own snapshots (already saved in metrics_save_loop)
-                if snapshot.node_identity == self.identity:
+                if node_identity == self.identity:
                     continue
 
                 # Skip local filesystem peers (they write their own files)
-                if snapshot.node_identity in self._shared_fs_peers:
+                if node_identity in self._shared_fs_peers:
                     continue
 
-                # Check if file already exists to avoid redundant writes
-                node_dir = self.metrics_dir.parent / snapshot.node_identity
-                filepath = node_dir / f"metrics_{snapshot.timestamp}.json"
+                snapshot = self._cached_snapshot(key, metadata)
+                if snapshot is None:
+                    continue
 
-                if not filepath.exists():
-                    self._save_peer_snapshot_to_disk(snapshot)
+                # Keys already on disk were recorded at startup load or save time
+                if await loop.run_in_executor(
+                    self._io_pool, self._save_peer_snapshot_to_disk, snapshot
+                ):
+                    self._persisted_snapshot_keys.add(key)
                     saved_count += 1
 
             if saved_count > 0:
@@ -336,7 +476,12 @@ class Node:
         self, id: str, node_list: list[tuple[str, dict[str, Any]]], n: int = 5, exclude_self: bool = True
     ) -> list[tuple[str, dict[str, Any]]]:
         """
-        Pick random neighbors from node list.
+        Pick random neighbors from node list, favouring nearby peers.
+
+        Uses weighted sampling without replacement (Efraimidis-Spirakis): each
+        peer draws ``random() ** (1 / weight)`` and the ``n`` largest draws win,
+        so nearer peers (see `_peer_weight`) are picked more often while every
+        peer keeps a chance of being chosen.
 
         Args:
             id: This node's identity
@@ -350,10 +495,22 @@ class Node:
         if exclude_self:
             node_list = [node for node in node_list if node[0] != id]
 
-        node_list = sorted(node_list)
-        if n > len(node_list):
-            n = len(node_list)
-        return random.sample(node_list, n) if node_list else []
+        if n >= len(node_list):
+            return random.sample(node_list, len(node_list))
+
+        draws = (
+            (random.random() ** (1.0 / self._peer_weight(nid, meta)), nid, meta)
+            for nid, meta in node_list
+        )
+        return [(nid, meta) for _, nid, meta in heapq.nlargest(n, draws, key=itemgetter(0))]
+
+    def _peer_weight(self, nid: str, meta: dict[str, Any]) -> float:
+        """Relative gossip weight of a peer: same filesystem > same host > remote."""
+        if nid in self._shared_fs_peers:
+            return 1.0
+        if meta.get("host") == self.transport.host:
+            return 0.3
+        return 0.1
 
     async def update_neighbours(self, shutting_down: bool = False) -> None:
         """Gossip state updates to random neighbors.
@@ -371,7 +528,7 @@ class Node:
         # removes us, but requires the shutting_down parameter to prevent
         # re-registration during shutdown.
         if (
-            self.identity not in self.state["node_register"].keys()
+            self.identity not in self.state["node_register"]
             and not shutting_down
         ):
             log.debug("Self not found in node register, re-adding.")
@@ -379,9 +536,14 @@ class Node:
                 self.identity, host=self.transport.host, port=self.transport.port
             )
 
+        # Nobody to gossip with yet (bootstrap or single node)
+        register = self.state["node_register"]
+        if len(register) - (self.identity in register) == 0:
+            return
+
         # Select random neighbors (self excluded automatically)
         neighbours = self.pick_random_neighbours(
-            self.identity, self.state["node_register"].values(), n=4, exclude_self=True
+            self.identity, register.values(), n=4, exclude_self=True
         )
 
         # Gossip state to each neighbor
@@ -389,126 +551,253 @@ class Node:
         #       - Work assignments
         #       - Performance metrics
         #       - Health status
+        # Bound once for the neighbour loop
+        send_multi = self.transport.send_multi
+        state = self.state
+        shared_fs_peers = self._shared_fs_peers
+
+        targets: list[str] = []
+        sends = []
         for nid, m in neighbours:
             node_socket = f"tcp://{m['host']}:{m['port']}"
-
-            log_type(f"sending node_register to {nid} {node_socket}")
-            await self.transport.send(nid, node_socket, "node_register", self.state)
-            log_type(f"sending scenarios to {nid} {node_socket}")
-            await self.transport.send(nid, node_socket, "scenarios", self.state)
+            topics = ["node_register", "scenarios"]
 
             # Skip gossiping metrics_snapshots to peers on same filesystem
             # They can read snapshots directly from disk
-            if nid in self._shared_fs_peers:
+            if nid in shared_fs_peers:
                 log.debug(
                     f"Skipping metrics_snapshots gossip to local filesystem peer {nid[:8]}..."
                 )
             else:
-                log_type(f"sending metrics_snapshots to {nid} {node_socket}")
-                await self.transport.send(nid, node_socket, "metrics_snapshots", self.state)
+                topics.append("metrics_snapshots")
+
+            # All topics for a neighbour travel in one combined frame
+            log_type(f"sending {', '.join(topics)} to {nid} {node_socket}")
+            targets.append(nid)
+            sends.append(send_multi(nid, node_socket, topics, state))
+
+        # Fan out so encoding and peer round-trips overlap instead of adding up
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for nid, result in zip(targets, results):
+            if isinstance(result, Exception):
+                log.warning(f"Failed to gossip to {nid}: {result}")
+
+    async def _announce_departure(self) -> None:
+        """Send our node_register tombstone to ceil(log2(n)) random peers.
+
+        Only the tombstone travels, and each peer acknowledges it, so the
+        departure is delivered before the transport closes; peers merge it
+        as an ordinary LWW remove and gossip it on from there.
+        """
+        register = self.state["node_register"]
+        peers = [(nid, m) for nid, m in register.values() if nid != self.identity]
+        if not peers:
+            return
+
+        neighbours = self.pick_random_neighbours(
+            self.identity, peers, n=max(1, ceil(log2(len(peers)))), exclude_self=False
+        )
+        departure = register.subset([self.identity])
+        results = await asyncio.gather(
+            *(
+                self.transport.announce(nid, f"tcp://{m['host']}:{m['port']}", "node_register", departure)
+                for nid, m in neighbours
+            ),
+            return_exceptions=True,
+        )
+        for (nid, _), result in zip(neighbours, results):
+            if isinstance(result, Exception):
+                log.warning(f"Failed to announce departure to {nid}: {result}")
+            else:
+                log.info(f"Announced departure to {nid}")
 
     def _get_snapshots_from_crdt(self) -> list[MetricsSnapshot]:
         """
         Reconstruct MetricsSnapshot objects from CRDT state.
 
+        Snapshots are immutable per key, so each one is decoded once and then
+        served from `_snapshot_cache`; keys no longer in the CRDT are dropped.
+        `_snapshot_index` is kept in step with the cache.
+
         Returns:
             List of MetricsSnapshot objects
         """
-        snapshots = []
+        cache = self._snapshot_cache
+        live: dict[Any, MetricsSnapshot] = {}
         for key, metadata in self.state["metrics_snapshots"].values():
-            try:
-                # Parse key: "node_identity:timestamp"
-                node_identity = metadata.get("node_identity", "")
-                timestamp = metadata.get("timestamp", 0)
-                snapshot_json = metadata.get("snapshot_json", "{}")
+            snapshot = cache.get(key)
+            if snapshot is None:
+                snapshot = self._snapshot_from_metadata(key, metadata)
+                if snapshot is None:
+                    continue
+                self._remember_snapshot(key, snapshot)
+            live[key] = snapshot
+
+        if len(self._snapshot_index) != len(live):
+            self._snapshot_index = [entry for entry in self._snapshot_index if entry[3] in live]
+        self._snapshot_cache = live
+        return list(live.values())
+
+    def _cached_snapshot(self, key: Any, metadata: dict[str, Any]) -> MetricsSnapshot | None:
+        """Get the decoded snapshot for one CRDT entry, decoding it at most once."""
+        snapshot = self._snapshot_cache.get(key)
+        if snapshot is None:
+            snapshot = self._snapshot_from_metadata(key, metadata)
+            if snapshot is not None:
+                self._remember_snapshot(key, snapshot)
+        return snapshot
+
+    def _remember_snapshot(self, key: Any, snapshot: MetricsSnapshot) -> None:
+        """Cache a decoded snapshot under its CRDT key and add it to the time index."""
+        if key in self._snapshot_cache:
+            return
+        self._snapshot_cache[key] = snapshot
+        insort(
+            self._snapshot_index,
+            (snapshot.timestamp, snapshot.node_identity, next(self._snapshot_seq), key),
+        )
 
-                snapshot_data = json.loads(snapshot_json)
+    def _snapshot_from_metadata(self, key: Any, metadata: dict[str, Any]) -> MetricsSnapshot | None:
+        """Decode one metrics_snapshots CRDT entry, or None if it is malformed."""
+        try:
+            # Parse key: "node_identity:timestamp"
+            node_identity = metadata.get("node_identity", "")
+            timestamp = metadata.get("timestamp", 0)
+            snapshot_json = metadata.get("snapshot_json", "{}")
 
-                snapshot = MetricsSnapshot(
-                    node_identity=node_identity,
-                    timestamp=int(timestamp),
-                    snapshot_data=snapshot_data,
-                )
-                snapshots.append(snapshot)
-            except (ValueError, json.JSONDecodeError, KeyError) as e:
-                log.warning(f"Failed to reconstruct snapshot from key {key}: {e}")
-                continue
+            snapshot_data = loads_snapshot_data(snapshot_json)
 
-        return snapshots
+            return MetricsSnapshot(
+                node_identity=node_identity,
+                timestamp=int(timestamp),
+                snapshot_data=snapshot_data,
+            )
+        except (ValueError, json.JSONDecodeError, KeyError) as e:
+            log.warning(f"Failed to reconstruct snapshot from key {key}: {e}")
+            return None
 
     def _cleanup_expired_snapshots(self) -> None:
         """Remove expired snapshots from CRDT state based on TTL."""
-        keys_to_remove = []
-
-        for key, metadata in self.state["metrics_snapshots"].values():
-            timestamp = metadata.get("timestamp", 0)
-            age = time() - timestamp
-
-            if age > self.metrics_snapshot_ttl_seconds:
-                keys_to_remove.append(key)
+        # One clock read per sweep, shared by the age check and the tombstones
+        now = time()
+        cutoff = now - self.metrics_snapshot_ttl_seconds
+        keys_to_remove = [
+            key
+            for key, metadata in self.state["metrics_snapshots"].values()
+            if metadata.get("timestamp", 0) < cutoff
+        ]
 
         for key in keys_to_remove:
-            self.state["metrics_snapshots"].remove(key)
+            self.state["metrics_snapshots"].remove(key, timestamp=now)
+            self._persisted_snapshot_keys.discard(key)
             log.debug(f"Removed expired snapshot: {key}")
+        self._forget_snapshots(keys_to_remove)
 
-    def _load_snapshots_from_disk(self) -> None:
+    def _forget_snapshots(self, keys: Iterable[Any]) -> None:
+        """Drop decoded snapshots (and their index entries) for removed keys."""
+        stale = {key for key in keys if self._snapshot_cache.pop(key, None) is not None}
+        if stale:
+            self._snapshot_index = [
+                entry for entry in self._snapshot_index if entry[3] not in stale
+            ]
+
+    async def _load_snapshots_from_disk(self) -> None:
         """Load all snapshots from disk into CRDT state on startup."""
-        metrics_base = self.metrics_dir.parent
-        loaded_count = 0
-        error_count = 0
+        loop = asyncio.get_running_loop()
+        loaded, error_count = await loop.run_in_executor(
+            self._io_pool, self._read_snapshots_from_disk
+        )
 
-        # Scan all node directories
-        if not metrics_base.exists():
-            return
+        for node_identity, timestamp, snapshot_json in loaded:
+            # Add to CRDT state using string key
+            snapshot_key = f"{node_identity}:{timestamp}"
+            self.state["metrics_snapshots"].add(
+                snapshot_key,
+                timestamp=timestamp,
+                node_identity=node_identity,
+                snapshot_json=snapshot_json,
+            )
+            self._persisted_snapshot_keys.add(snapshot_key)
 
-        for node_dir in metrics_base.iterdir():
-            if not node_dir.is_dir():
-                continue
+        log.info(
+            f"Loaded {len(loaded)} snapshots from disk "
+            f"({error_count} errors, skipped expired snapshots)"
+        )
 
-            node_identity = node_dir.name
+    def _read_snapshots_from_disk(self) -> tuple[list[tuple[str, int, str]], int]:
+        """
+        Read unexpired snapshot files for every node directory.
 
-            # Load all metrics_*.json files for this node
-            for snapshot_file in node_dir.glob("metrics_*.json"):
-                try:
-                    snapshot_data = json.loads(snapshot_file.read_text(encoding="utf-8"))
-                    timestamp = int(snapshot_file.stem.split("_")[1])
+        Runs on the I/O pool, so it only touches the filesystem, never CRDT state.
 
-                    # Skip expired snapshots
-                    age = time() - timestamp
-                    if age > self.metrics_snapshot_ttl_seconds:
-                        continue
+        Returns:
+            ((node_identity, timestamp, snapshot_json) entries, error count)
+        """
+        metrics_base = self.metrics_dir.parent
+        pending: list[tuple[str, int, str]] = []
+        error_count = 0
+        cutoff = time() - self.metrics_snapshot_ttl_seconds
 
-                    # Add to CRDT state using string key
-                    snapshot_key = f"{node_identity}:{timestamp}"
-                    self.state["metrics_snapshots"].add(
-                        snapshot_key,
-                        timestamp=timestamp,
-                        node_identity=node_identity,
-                        snapshot_json=json.dumps(snapshot_data),
+        # Scan all node directories
+        try:
+            node_dirs = [entry for entry in os.scandir(metrics_base) if entry.is_dir()]
+        except FileNotFoundError:
+            return [], error_count
+
+        for node_dir in node_dirs:
+            # Hourly metrics_<hour>.log files, plus metrics_<timestamp>.json from
+            # older releases; files that are entirely expired are never opened
+            for entry in os.scandir(node_dir.path):
+                name = entry.name
+                if not name.startswith("metrics_"):
+                    continue
+                if name.endswith(".log"):
+                    stem, span = name[8:-4], SNAPSHOT_LOG_ROTATE_SECONDS
+                elif name.endswith(".json"):
+                    stem, span = name[8:-5], 1
+                else:
+                    continue
+                try:
+                    timestamp = int(stem)
+                except ValueError as e:
+                    log.warning(f"Failed to load snapshot {entry.path}: {e}")
+                    error_count += 1
+                    continue
+                if timestamp + span <= cutoff:
+                    continue
+                pending.append((node_dir.name, timestamp, entry.path))
+
+        # Log records go into the CRDT as-is; they are decoded only when used
+        loaded: list[tuple[str, int, str]] = []
+        for node_identity, _, path in pending:
+            records, error = _read_snapshot_file(path, cutoff)
+            if error is not None:
+                log.warning(f"Failed to load snapshot {path}: {error}")
+                error_count += 1
+            for ts, snapshot_json in records:
+                # Peers reject a whole metrics_snapshots frame over one long string
+                if len(snapshot_json) > MAX_STRING_LENGTH:
+                    log.warning(
+                        f"Skipping snapshot {node_identity}:{ts} from {path}: "
+                        f"{len(snapshot_json)} chars exceeds {MAX_STRING_LENGTH}"
                     )
-                    loaded_count += 1
-
-                except Exception as e:
-                    log.warning(f"Failed to load snapshot {snapshot_file}: {e}")
                     error_count += 1
+                    continue
+                loaded.append((node_identity, ts, snapshot_json))
 
-        log.info(
-            f"Loaded {loaded_count} snapshots from disk "
-            f"({error_count} errors, skipped expired snapshots)"
-        )
+        return loaded, error_count
 
-    def _save_peer_snapshot_to_disk(self, snapshot: MetricsSnapshot) -> None:
-        """Save a peer snapshot to disk for persistence."""
+    def _save_peer_snapshot_to_disk(self, snapshot: MetricsSnapshot) -> bool:
+        """Save a peer snapshot to disk for persistence. Returns True once written."""
         # Create directory for this node if it doesn't exist
         node_dir = self.metrics_dir.parent / snapshot.node_identity
         node_dir.mkdir(parents=True, exist_ok=True)
 
         # Save snapshot
-        filepath = node_dir / f"metrics_{snapshot.timestamp}.json"
+        filepath = snapshot_log_path(node_dir, snapshot.timestamp)
         try:
-            filepath.write_text(
-                json.dumps(snapshot.snapshot_data, indent=2),
-                encoding="utf-8"
+            append_snapshot_record(
+                filepath, snapshot.timestamp, dumps_snapshot_data(snapshot.snapshot_data)
             )
             log.debug(
                 f"Saved peer snapshot: {snapshot.node_identity[:8]}... "
@@ -516,6 +805,8 @@ class Node:
             )
         except Exception as e:
             log.error(f"Failed to save peer snapshot: {e}")
+            return False
+        return True
 
     def _get_recent_snapshots_for_node(self, node_identity: str | None = None) -> list[MetricsSnapshot]:
         """
@@ -530,25 +821,25 @@ class Node:
         current_time = int(time())
         cutoff_time = current_time - self.metrics_gossip_window_seconds
 
-        all_snapshots = self._get_snapshots_from_crdt()
-
-        snapshots = []
-        for snapshot in all_snapshots:
-            if snapshot.timestamp >= cutoff_time:
-                if node_identity is None or snapshot.node_identity == node_identity:
-                    snapshots.append(snapshot)
+        # Syncs the cache and timestamp index with the CRDT
+        self._get_snapshots_from_crdt()
 
-        return sorted(snapshots)
+        # The index is already in snapshot order; start at the window edge
+        index = self._snapshot_index
+        cache = self._snapshot_cache
+        return [
+            cache[key]
+            for _, identity, _, key in index[bisect_left(index, (cutoff_time,)):]
+            if node_identity is None or identity == node_identity
+        ]
 
     def show(self) -> None:
         """Display current CRDT state (debug method)."""
-        node_register_keys = self.state["node_register"].keys()
-        scenarios_keys = self.state["scenarios"].keys()
         log.debug(
             f"Node state - Identity: {self.identity[:8]}... "
             f"Index: {self.index}, Count: {self.count}, "
-            f"Registered nodes: {len(node_register_keys)}, "
-            f"Active scenarios: {len(scenarios_keys)}"
+            f"Registered nodes: {len(self.state['node_register'])}, "
+            f"Active scenarios: {len(self.state['scenarios'])}"
         )
 
     async def shutdown(self) -> None:
@@ -557,7 +848,7 @@ class Node:
         1. Stop accepting new work (running=False)
         2. Shutdown scheduler and complete running journeys
         3. Remove self from node register
-        4. Notify peers of departure via gossip
+        4. Announce the departure to ~log2(n) random peers
         5. Shutdown transport (stops listen loop, closes connections)
         6. Stop web server if running
         """
@@ -569,7 +860,7 @@ class Node:
 
         # Remove self from node register and notify peers
         self.state["node_register"].remove(self.identity)
-        await self.update_neighbours(shutting_down=True)
+        await self._announce_departure()
 
         # Shutdown transport (signals listen loop to stop)
         # Note: shutdown() is available on ZMQTransport but not the base Transport interface
@@ -580,8 +871,47 @@ class Node:
         # Note: HTTP sessions now managed via Context and cleaned up automatically
         self.transport.close()
 
+        # Let in-flight snapshot writes finish without blocking the loop
+        if self._io_pool is not None:
+            io_pool, self._io_pool = self._io_pool, None
+            await asyncio.to_thread(io_pool.shutdown)
+
         # Stop web server if configured
         if self.web_server:
             await self.web_server.stop()
 
         log.info("Node shutdown complete.")
+
+
+def _weak_callback(method: Callable[..., None]) -> Callable[..., None]:
+    """Wrap a bound method so holding the callback does not keep its owner alive."""
+    ref = weakref.WeakMethod(method)
+
+    def callback(*args: Any) -> None:
+        bound = ref()
+        if bound is not None:
+            bound(*args)
+
+    return callback
+
+
+def _read_snapshot_file(path: str, min_timestamp: float) -> tuple[list[tuple[int, str]], Exception | None]:
+    """
+    Read (timestamp, snapshot_json) records from one snapshot file.
+
+    Errors are returned alongside the records read before them, not raised.
+    Log records were written compactly by dumps_snapshot_data and are
+    CRC-checked by gzip, so they are passed through as-is; legacy JSON files
+    may be pretty-printed or corrupt, so they are decoded and re-encoded.
+    """
+    records: list[tuple[int, str]] = []
+    try:
+        if path.endswith(".log"):
+            records.extend(iter_snapshot_records(path, min_timestamp=int(min_timestamp)))
+        else:
+            with open(path, "rb") as f:
+                snapshot_data = loads_snapshot_data(f.read())
+            records.append((int(Path(path).stem[8:]), dumps_snapshot_data(snapshot_data)))
+    except (OSError, ValueError, EOFError, zlib.error) as e:
+        return records, e
+    return records, None
@@ -11,7 +11,9 @@ import ast
 import importlib
 import importlib.util
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +22,12 @@ from ironswarm.volumemodel import VolumeModel, DynamicVolumeModel
 
 log = logging.getLogger(__name__)
 
+# Upper bound on threads validating scenario files in one discovery pass
+_MAX_DISCOVERY_WORKERS = 8
+
+# file path -> (st_mtime_ns, st_size, scenario_info) from the last discovery
+_SCENARIO_CACHE: dict[str, tuple[int, int, dict[str, Any]]] = {}
+
 
 class ScenarioValidationError(Exception):
     """Raised when scenario validation fails."""
@@ -42,6 +50,10 @@ def discover_scenarios(directory: Path) -> list[dict[str, Any]]:
             'valid': bool,
             'error': str | None
         }
+
+        Results are cached per file and reused while its mtime and size are
+        unchanged, so re-scans skip parsing and importing untouched files.
+        Edits to modules a scenario imports are not tracked.
     """
     if not directory.exists():
         log.warning(f"Scenarios directory does not exist: {directory}")
@@ -51,48 +63,90 @@ def discover_scenarios(directory: Path) -> list[dict[str, Any]]:
         log.error(f"Scenarios path is not a directory: {directory}")
         return []
 
-    scenarios = []
+    scenarios: list[dict[str, Any] | None] = []
+    misses: list[tuple[int, Path, int, int]] = []
 
-    for py_file in directory.glob("*.py"):
-        if py_file.name.startswith("_"):
+    # scandir yields names and stat data in one directory read; Path objects
+    # are only built for the files kept
+    with os.scandir(directory) as entries:
+        candidates = [
+            entry for entry in entries
             # Skip private modules like __init__.py
+            if entry.name.endswith(".py") and not entry.name.startswith("_")
+        ]
+
+    for entry in candidates:
+        py_file = directory / entry.name
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        cached = _SCENARIO_CACHE.get(str(py_file))
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            scenarios.append(dict(cached[2]))
             continue
 
-        scenario_info = {
-            'file_path': str(py_file),
-            'name': py_file.stem,
-            'valid': False,
-            'error': None,
-            'module_spec': None,
-            'metadata': None,
-        }
+        misses.append((len(scenarios), py_file, st.st_mtime_ns, st.st_size))
+        scenarios.append(None)
 
-        try:
-            # Validate the scenario file
-            scenario_obj = validate_scenario_file(py_file)
+    if misses:
+        # Files are validated independently; each import uses its own
+        # "scenario_<stem>" module name, so the workers never share a
+        # sys.modules entry.
+        with ThreadPoolExecutor(max_workers=min(_MAX_DISCOVERY_WORKERS, len(misses))) as pool:
+            results = pool.map(
+                lambda miss: _discover_scenario(miss[1], directory.parent), misses
+            )
+            for (slot, py_file, mtime_ns, size), (scenario_info, cacheable) in zip(misses, results):
+                if cacheable:
+                    _SCENARIO_CACHE[str(py_file)] = (mtime_ns, size, scenario_info)
+                    scenario_info = dict(scenario_info)
+                scenarios[slot] = scenario_info
 
-            # Convert to module spec
-            module_spec = file_path_to_module_spec(py_file, directory.parent)
+    return scenarios
 
-            # Extract metadata
-            metadata = get_scenario_metadata(scenario_obj)
 
-            scenario_info.update({
-                'valid': True,
-                'module_spec': module_spec,
-                'metadata': metadata,
-            })
+def _discover_scenario(py_file: Path, base_dir: Path) -> tuple[dict[str, Any], bool]:
+    """Validate one scenario file and build its discovery entry.
 
-        except ScenarioValidationError as e:
-            scenario_info['error'] = str(e)
-            log.debug(f"Invalid scenario file {py_file}: {e}")
-        except Exception as e:
-            scenario_info['error'] = f"Unexpected error: {str(e)}"
-            log.error(f"Error processing scenario file {py_file}: {e}", exc_info=True)
+    Returns:
+        The scenario_info dictionary and whether it may be cached; unexpected
+        failures are not, as they may not be down to the file itself.
+    """
+    scenario_info = {
+        'file_path': str(py_file),
+        'name': py_file.stem,
+        'valid': False,
+        'error': None,
+        'module_spec': None,
+        'metadata': None,
+    }
 
-        scenarios.append(scenario_info)
+    try:
+        # Validate the scenario file
+        scenario_obj = validate_scenario_file(py_file)
 
-    return scenarios
+        # Convert to module spec
+        module_spec = file_path_to_module_spec(py_file, base_dir)
+
+        # Extract metadata
+        metadata = get_scenario_metadata(scenario_obj)
+
+        scenario_info.update({
+            'valid': True,
+            'module_spec': module_spec,
+            'metadata': metadata,
+        })
+
+    except ScenarioValidationError as e:
+        scenario_info['error'] = str(e)
+        log.debug(f"Invalid scenario file {py_file}: {e}")
+    except Exception as e:
+        scenario_info['error'] = f"Unexpected error: {str(e)}"
+        log.error(f"Error processing scenario file {py_file}: {e}", exc_info=True)
+        return scenario_info, False
+
+    return scenario_info, True
 
 
 def validate_scenario_file(file_path: Path) -> Scenario:
@@ -107,27 +161,33 @@ def validate_scenario_file(file_path: Path) -> Scenario:
     Raises:
         ScenarioValidationError: If validation fails at any level.
     """
-    # Level 1: Syntax validation
+    # Level 1: Syntax validation (the tree is reused for level 2)
     try:
         with open(file_path, 'r') as f:
             source_code = f.read()
-        ast.parse(source_code)
+        tree = ast.parse(source_code)
     except SyntaxError as e:
         raise ScenarioValidationError(f"Syntax error: {e}")
     except Exception as e:
         raise ScenarioValidationError(f"Failed to read file: {e}")
 
     # Level 2: Structure validation - check for 'scenario' variable
+    # Scenario files assign it as a top-level statement, so only tree.body is
+    # scanned rather than every node in the module
     try:
-        tree = ast.parse(source_code)
         has_scenario_var = False
 
-        for node in ast.walk(tree):
+        for node in tree.body:
             if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == 'scenario':
-                        has_scenario_var = True
-                        break
+                targets = node.targets
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                # scenario: Scenario = ... (a bare annotation assigns nothing)
+                targets = [node.target]
+            else:
+                continue
+            if any(isinstance(target, ast.Name) and target.id == 'scenario' for target in targets):
+                has_scenario_var = True
+                break
 
         if not has_scenario_var:
             raise ScenarioValidationError(
@@ -150,10 +210,14 @@ def validate_scenario_file(file_path: Path) -> Scenario:
 
         module = importlib.util.module_from_spec(spec)
 
+        # Compile the tree parsed in level 1 rather than letting the loader
+        # read and parse the file a second time
+        code = compile(tree, str(file_path), "exec")
+
         # Temporarily add to sys.modules to allow relative imports
         sys.modules[spec.name] = module
         try:
-            spec.loader.exec_module(module)
+            exec(code, module.__dict__)
         finally:
             # Clean up sys.modules
             sys.modules.pop(spec.name, None)
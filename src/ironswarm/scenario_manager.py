@@ -4,8 +4,10 @@ import asyncio
 import importlib
 import logging
 import time
+import zlib
 from collections import namedtuple
 from collections.abc import Iterator
+from functools import lru_cache
 from typing import Any
 
 from ironswarm.context import Context
@@ -19,6 +21,9 @@ log = logging.getLogger(__name__)
 
 Work = namedtuple("Work", ["start_time", "journey_spec", "data", "subint_volumes"])
 
+# Seconds added to interval waits so wakeups land after the boundary, not on it
+INTERVAL_WAKE_MARGIN = 1e-3
+
 def spec_import(spec: str) -> Any:
     """Import a journey function from a module spec.
 
@@ -37,6 +42,16 @@ def spec_import(spec: str) -> Any:
     return getattr(importlib.import_module(module), attr)
 
 
+@lru_cache(maxsize=None)
+def _spec_offset(spec: str) -> int:
+    """Stable hash of a journey spec.
+
+    Every node must derive the same offset, and hash() of a str is salted per
+    process (PYTHONHASHSEED), so CRC32 is used instead.
+    """
+    return zlib.crc32(spec.encode())
+
+
 class ScenarioManager:
     def __init__(
         self,
@@ -48,7 +63,7 @@ class ScenarioManager:
         self.start_time: float = start_time
         self.scenario: Scenario = scenario
 
-        self.work_resolved: list[int] = []
+        self.work_resolved: set[int] = set()  # O(1) "already processed" checks
         self.journeys_complete: dict[Journey, int] = {}
 
         self.total_spawned_journeys: int = 0
@@ -71,53 +86,43 @@ class ScenarioManager:
     async def resolve(self) -> None:
         """Main loop to resolve work intervals."""
         self.running = True
-        while self.running:
-            # calculate time until next work interval
-            time_until_next_interval = self.scenario.interval - self.elapsed % self.scenario.interval
-            log.debug(f"Time until next work interval: {time_until_next_interval}")
-
-            # Wait for either the interval sleep OR the stop event (whichever comes first)
-            sleep_task = asyncio.create_task(asyncio.sleep(time_until_next_interval))
-            stop_task = asyncio.create_task(self._stop_event.wait())
-
-            try:
-                done, pending = await asyncio.wait(
-                    {sleep_task, stop_task},
-                    return_when=asyncio.FIRST_COMPLETED
-                )
+        interval = self.scenario.interval
+        # One waiter for the whole run; each interval only arms a timeout on it
+        stop_task = asyncio.create_task(self._stop_event.wait())
+        try:
+            while self.running:
+                # calculate time until next work interval; wake just past the
+                # boundary so the work index has always advanced
+                time_until_next_interval = interval - self.elapsed % interval + INTERVAL_WAKE_MARGIN
+                log.debug(f"Time until next work interval: {time_until_next_interval}")
 
-                # Cancel the task that didn't complete
-                for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
+                # Wait for either the interval to elapse OR the stop event
+                try:
+                    done, _ = await asyncio.wait({stop_task}, timeout=time_until_next_interval)
+                except asyncio.CancelledError:
+                    # Handle cancellation of the entire resolve task
+                    break
 
                 # If stop event was triggered, exit immediately
-                if stop_task in done:
+                if done:
                     log.info("Scenario termination requested, exiting immediately")
                     break
-            except asyncio.CancelledError:
-                # Handle cancellation of the entire resolve task
-                sleep_task.cancel()
-                stop_task.cancel()
-                break
-
-            await self._resolve()
-
-    async def _resolve(self) -> None:
-        """Process a single work interval."""
-        if self.work_index() in self.work_resolved:
-            # Already processed this work interval
-            # Check if scenario is complete to exit early instead of sleeping
-            if not self.running:
-                return  # Scenario complete, exit immediately
-            await asyncio.sleep(self.scenario.journey_separation)
+
+                # One clock read after waking serves the whole interval
+                await self._resolve(self.work_index())
+        finally:
+            stop_task.cancel()
+
+    async def _resolve(self, work_index: int | None = None) -> None:
+        """Process a single work interval (the current one unless given)."""
+        if work_index is None:
+            work_index = self.work_index()
+        if work_index in self.work_resolved:
+            # Already processed; resolve() schedules the wait for the next one
             return
 
-        self.work_resolved.append(self.work_index())
-        work_interval = self.work()
+        self.work_resolved.add(work_index)
+        work_interval = self.work(work_index)
         for work in work_interval:
             task = asyncio.create_task(
                 self.spawn_journeys(work.journey_spec, work.subint_volumes, work.data)
@@ -145,6 +150,16 @@ class ScenarioManager:
             datapool_chunk: Optional iterator of datapool items.
         """
         journey_object = spec_import(journey_spec)
+        run_journey = self._run_journey_with_context
+        create_task = asyncio.create_task
+        track_task = self._background_tasks.add
+        untrack_task = self._background_tasks.discard
+        # Copied per journey since Context keeps (and may mutate) the dict it is given
+        metadata = {
+            "scenario": self.scenario.__class__.__name__,
+            "journey_spec": journey_spec,
+            "node": self.node.identity,
+        }
 
         for interval_idx in range(int(self.scenario.interval / self.scenario.journey_separation)):
             try:
@@ -152,36 +167,28 @@ class ScenarioManager:
             except IndexError:
                 return
 
+            spawned = 0
             for _ in range(sub_interval_volume):
-                # Create fresh Context for each journey execution
-                # Provides unique trace ID and isolated resources
-                context = Context(
-                    metadata={
-                        "scenario": self.scenario.__class__.__name__,
-                        "journey_spec": journey_spec,
-                        "node": self.node.identity,
-                    }
-                )
-
+                # Take the datapool item first so exhaustion doesn't build a Context
                 if datapool_chunk:
                     try:
-                        datapool_item = next(datapool_chunk)
-                        task = asyncio.create_task(self._run_journey_with_context(
-                            journey_object, context, datapool_item
-                        ))
-                        self._background_tasks.add(task)
-                        task.add_done_callback(self._background_tasks.discard)
+                        args: tuple[Any, ...] = (next(datapool_chunk),)
                     except StopIteration:
                         log.warning("Datapool exhausted. No more items available.")
                         break
                 else:
-                    task = asyncio.create_task(self._run_journey_with_context(
-                        journey_object, context
-                    ))
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._background_tasks.discard)
+                    args = ()
+
+                # Create fresh Context for each journey execution
+                # Provides unique trace ID and isolated resources
+                context = Context(metadata=dict(metadata))
+
+                task = create_task(run_journey(journey_object, context, *args))
+                track_task(task)
+                task.add_done_callback(untrack_task)
+                spawned += 1
 
-                self.total_spawned_journeys += 1
+            self.total_spawned_journeys += spawned
 
             await asyncio.sleep(self.scenario.journey_separation)
 
@@ -248,27 +255,28 @@ class ScenarioManager:
 
             # Use journey spec hash to deterministically distribute journeys across nodes
             # This prevents all journeys with small volumes from going to node 0
-            journey_offset = hash(journey.spec) % self.node.count
+            journey_offset = _spec_offset(journey.spec) % self.node.count
 
-            node_total_journeys: dict[int, int] = {}
+            volumes: list[int] = []
             for i in range(self.scenario.interval):
                 try:
-                    journey_volume_i = journey.volumemodel(work_start_time + i)
-
-                    for node_index in range(self.node.count):
-                        node_volume = node_target_volume(
-                            node_index, self.node.count, journey_volume_i, journey_offset=journey_offset
-                        )
-                        node_total_journeys[node_index] = node_total_journeys.get(node_index, 0) + node_volume
-                        if node_index == self.node.index:
-                            subinterval_volumes.append(node_volume)
-
+                    volumes.append(journey.volumemodel(work_start_time + i))
                 except JourneyComplete:
                     log.warning(f"Journey will be completed, after next interval: {journey.spec=}, removing from scenario")
                     self.journeys_complete[journey] = work_index
                     break
 
-            total_journey_calls = sum(node_total_journeys.values())
+            # Only this node's share is needed per second; every second's
+            # volume is split across all nodes, so the total is just the sum
+            node_count = self.node.count
+            node_index = self.node.index
+            if node_index is not None and node_index < node_count:
+                subinterval_volumes = [
+                    node_target_volume(node_index, node_count, volume, journey_offset=journey_offset)
+                    for volume in volumes
+                ]
+
+            total_journey_calls = sum(volumes)
 
             if total_journey_calls == 0:
                 continue
@@ -286,10 +294,11 @@ class ScenarioManager:
                     )
 
                 node_offset = sum(
-                    node_total for idx, node_total in node_total_journeys.items() if idx < self.node.index
+                    nodes_before_volume(self.node.index, self.node.count, volume, journey_offset=journey_offset)
+                    for volume in volumes
                 )
                 checkout_start = journey.datapool.index + node_offset
-                checkout_stop = checkout_start + node_total_journeys[self.node.index]
+                checkout_stop = checkout_start + sum(subinterval_volumes)
 
                 # Check if datapool is exhausted before attempting checkout
                 if checkout_start > len(journey.datapool):
@@ -342,34 +351,51 @@ def node_target_volume(
         >>> node_target_volume(1, 10, 1, journey_offset=1)  # With offset, node 1 gets it
         1
     """
-    # No work to distribute
-    if target_volume == 0:
-        return 0
-
-    # Validate node index
-    if node_index >= node_count:
+    # No work to distribute, or node index out of range
+    if target_volume == 0 or node_index >= node_count:
         return 0
 
     # Standard case: distribute work evenly with remainder handling
-    base_volume = target_volume // node_count
-    remainder = target_volume % node_count
+    base_volume, remainder = divmod(target_volume, node_count)
 
     # Apply journey_offset to rotate which nodes get the remainder work
     # This ensures that different journeys (via different offsets) get distributed
-    # across different nodes instead of all going to node 0
-    remainder_start = journey_offset % node_count
-    remainder_end = (remainder_start + remainder) % node_count
+    # across different nodes instead of all going to node 0. The remainder goes
+    # to the cyclic range [journey_offset, journey_offset + remainder), so a node
+    # is in it when its distance past the start, mod node_count, is below remainder.
+    if (node_index - journey_offset) % node_count < remainder:
+        return base_volume + 1
 
-    # Check if this node falls within the remainder range (accounting for wraparound)
-    if remainder > 0:
-        if remainder_end > remainder_start:
-            # Normal case: remainder goes to nodes [remainder_start, remainder_end)
-            node_gets_remainder = remainder_start <= node_index < remainder_end
-        else:
-            # Wraparound case: remainder goes to nodes [remainder_start, n) + [0, remainder_end)
-            node_gets_remainder = node_index >= remainder_start or node_index < remainder_end
+    return base_volume
 
-        if node_gets_remainder:
-            return base_volume + 1
 
-    return base_volume
+def nodes_before_volume(
+    node_index: int, node_count: int, target_volume: int, journey_offset: int = 0
+) -> int:
+    """
+    Total work items `node_target_volume` assigns to nodes 0..node_index-1.
+
+    Equivalent to summing `node_target_volume` over those nodes, in O(1): each
+    gets the base share, and the remainder goes to the cyclic node range
+    starting at `journey_offset`, of which only the part below node_index counts.
+
+    Examples:
+        >>> nodes_before_volume(3, 10, 25)  # nodes 0-4 get 3, the rest 2
+        9
+        >>> nodes_before_volume(1, 10, 1, journey_offset=1)
+        0
+    """
+    if target_volume == 0 or node_index <= 0:
+        return 0
+
+    node_index = min(node_index, node_count)
+    base_volume = target_volume // node_count
+    remainder = target_volume % node_count
+
+    remainder_start = journey_offset % node_count
+    remainder_stop = remainder_start + remainder
+    # Remainder nodes are [remainder_start, remainder_stop) wrapped at node_count
+    before = max(0, min(remainder_stop, node_count, node_index) - remainder_start)
+    before += min(max(0, remainder_stop - node_count), node_index)
+
+    return node_index * base_volume + before
@@ -6,6 +6,7 @@ to prevent arbitrary code execution attacks from malicious nodes.
 """
 
 import logging
+import zlib
 from typing import Any
 
 import msgpack  # type: ignore[import-untyped]
@@ -20,6 +21,10 @@ MAX_COLLECTION_SIZE = 100_000  # Max items in add_set/remove_set
 MAX_METADATA_KEYS = 50  # Max keys in metadata dict
 MAX_STRING_LENGTH = 10 * 1024  # 10KB - Allow for metrics snapshots with histogram data
 
+# 0xc1 is never used by msgpack, so it marks a zlib-compressed frame unambiguously
+COMPRESSED_FRAME_PREFIX = b"\xc1"
+COMPRESSION_LEVEL = 1
+
 
 class SerializationError(Exception):
     """Raised when serialization/deserialization fails."""
@@ -86,8 +91,10 @@ def validate_element_set(data: Any, context: str) -> None:
                 f"{context}[{key!r}]: Key too long ({len(key)} > {MAX_STRING_LENGTH})"
             )
 
-        # Validate value (metadata dict)
-        validate_metadata(value, f"{context}[{key!r}]")
+        # Validate value (metadata dict); the context is only formatted on failure
+        error = _metadata_error(value)
+        if error:
+            raise ValidationError(f"{context}[{key!r}]{error}")
 
 
 def validate_metadata(data: Any, context: str) -> None:
@@ -101,27 +108,34 @@ def validate_metadata(data: Any, context: str) -> None:
     Raises:
         ValidationError: If validation fails
     """
+    error = _metadata_error(data)
+    if error:
+        raise ValidationError(f"{context}{error}")
+
+
+def _metadata_error(data: Any) -> str | None:
+    # Returns the message suffix for the first problem found, or None if valid
     if not isinstance(data, dict):
-        raise ValidationError(f"{context}: Expected dict, got {type(data).__name__}")
+        return f": Expected dict, got {type(data).__name__}"
 
     if len(data) > MAX_METADATA_KEYS:
-        raise ValidationError(
-            f"{context}: Too many metadata keys ({len(data)} > {MAX_METADATA_KEYS})"
-        )
+        return f": Too many metadata keys ({len(data)} > {MAX_METADATA_KEYS})"
 
     # Must have timestamp
     if "timestamp" not in data:
-        raise ValidationError(f"{context}: Missing required 'timestamp' key")
+        return ": Missing required 'timestamp' key"
 
     # Validate timestamp
     timestamp = data["timestamp"]
     if not isinstance(timestamp, (int, float)):
-        raise ValidationError(
-            f"{context}.timestamp: Expected number, got {type(timestamp).__name__}"
-        )
+        return f".timestamp: Expected number, got {type(timestamp).__name__}"
 
     if timestamp < 0:
-        raise ValidationError(f"{context}.timestamp: Cannot be negative")
+        return ".timestamp: Cannot be negative"
+
+    # Most entries carry only a timestamp
+    if len(data) == 1:
+        return None
 
     # Validate other metadata values
     for key, value in data.items():
@@ -130,15 +144,13 @@ def validate_metadata(data: Any, context: str) -> None:
 
         # Only allow safe types in metadata
         if not isinstance(value, (str, int, float, bool, type(None))):
-            raise ValidationError(
-                f"{context}.{key}: Unsupported type {type(value).__name__}"
-            )
+            return f".{key}: Unsupported type {type(value).__name__}"
 
         # String length limits
         if isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
-            raise ValidationError(
-                f"{context}.{key}: String too long ({len(value)} > {MAX_STRING_LENGTH})"
-            )
+            return f".{key}: String too long ({len(value)} > {MAX_STRING_LENGTH})"
+
+    return None
 
 
 def serialize_lww(lww: LWWElementSet) -> bytes:
@@ -183,15 +195,204 @@ def deserialize_lww(data: bytes) -> LWWElementSet:
         SerializationError: If deserialization fails
         ValidationError: If schema validation fails
     """
+    unpacked = _unpack(data)
+
+    # Validate schema
+    validate_lww_dict(unpacked, "LWWElementSet")
+
+    # Construct LWWElementSet
+    try:
+        return LWWElementSet.from_dict(unpacked)
+    except (TypeError, ValueError, KeyError) as e:
+        raise SerializationError(f"Failed to construct LWWElementSet: {e}") from e
+
+
+def validate_digest_dict(data: Any, context: str = "root") -> None:
+    """
+    Validate an LWWElementSet digest (element -> timestamp per set).
+
+    Args:
+        data: Data to validate
+        context: Context string for error messages
+
+    Raises:
+        ValidationError: If validation fails
+    """
+    if not isinstance(data, dict):
+        raise ValidationError(f"{context}: Expected dict, got {type(data).__name__}")
+
+    required_keys = {"add_set", "remove_set"}
+    if set(data.keys()) != required_keys:
+        raise ValidationError(
+            f"{context}: Expected keys {required_keys}, got {set(data.keys())}"
+        )
+
+    for set_name in ["add_set", "remove_set"]:
+        entries = data[set_name]
+        set_context = f"{context}.{set_name}"
+        if not isinstance(entries, dict):
+            raise ValidationError(
+                f"{set_context}: Expected dict, got {type(entries).__name__}"
+            )
+        validate_key_list(list(entries), set_context)
+        for key, timestamp in entries.items():
+            if not isinstance(timestamp, (int, float)) or timestamp < 0:
+                raise ValidationError(
+                    f"{set_context}[{key!r}]: Expected non-negative timestamp"
+                )
+
+
+def validate_key_list(data: Any, context: str = "root") -> None:
+    """
+    Validate a list of element keys.
+
+    Args:
+        data: Data to validate
+        context: Context string for error messages
+
+    Raises:
+        ValidationError: If validation fails
+    """
+    if not isinstance(data, list):
+        raise ValidationError(f"{context}: Expected list, got {type(data).__name__}")
+
+    if len(data) > MAX_COLLECTION_SIZE:
+        raise ValidationError(
+            f"{context}: Too many elements ({len(data)} > {MAX_COLLECTION_SIZE})"
+        )
+
+    for key in data:
+        if not isinstance(key, str):
+            raise ValidationError(
+                f"{context}[{key!r}]: Key must be string, got {type(key).__name__}"
+            )
+        if len(key) > MAX_STRING_LENGTH:
+            raise ValidationError(
+                f"{context}[{key!r}]: Key too long ({len(key)} > {MAX_STRING_LENGTH})"
+            )
+
+
+def serialize_digest(digest: dict[str, dict[Any, float]]) -> bytes:
+    """
+    Serialize an LWWElementSet digest to msgpack bytes.
+
+    Args:
+        digest: Result of LWWElementSet.digest()
+
+    Returns:
+        Serialized bytes
+
+    Raises:
+        SerializationError: If serialization fails
+    """
+    return _pack(digest)
+
+
+def deserialize_digest(data: bytes) -> dict[str, dict[str, float]]:
+    """
+    Deserialize msgpack bytes to an LWWElementSet digest with validation.
+
+    Args:
+        data: Serialized bytes
+
+    Returns:
+        Digest dictionary with 'add_set' and 'remove_set' keys
+
+    Raises:
+        SerializationError: If deserialization fails
+        ValidationError: If schema validation fails
+    """
+    unpacked = _unpack(data)
+    validate_digest_dict(unpacked, "Digest")
+    return unpacked
+
+
+def serialize_keys(keys: list[Any]) -> bytes:
+    """
+    Serialize a list of element keys to msgpack bytes.
+
+    Args:
+        keys: Element keys, e.g. from LWWElementSet.newer_in()
+
+    Returns:
+        Serialized bytes
+
+    Raises:
+        SerializationError: If serialization fails
+    """
+    return _pack(keys)
+
+
+def deserialize_keys(data: bytes) -> list[str]:
+    """
+    Deserialize msgpack bytes to a list of element keys with validation.
+
+    Args:
+        data: Serialized bytes
+
+    Returns:
+        List of element keys
+
+    Raises:
+        SerializationError: If deserialization fails
+        ValidationError: If schema validation fails
+    """
+    unpacked = _unpack(data)
+    validate_key_list(unpacked, "Keys")
+    return unpacked
+
+
+def compress_frame(data: bytes) -> bytes:
+    """
+    Compress a serialized frame; any deserialize_* function accepts the result.
+
+    Args:
+        data: Bytes from one of the serialize_* functions
+
+    Returns:
+        Prefixed, zlib-compressed bytes
+    """
+    return COMPRESSED_FRAME_PREFIX + zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def _decompress_frame(data: bytes) -> bytes:
+    # Bounded so a small frame cannot expand past the message size limit
+    decompressor = zlib.decompressobj()
+    try:
+        unpacked = decompressor.decompress(data[len(COMPRESSED_FRAME_PREFIX):], MAX_MESSAGE_SIZE)
+    except zlib.error as e:
+        raise SerializationError(f"Failed to decompress: {e}") from e
+    if decompressor.unconsumed_tail:
+        raise ValidationError(f"Decompressed message exceeds {MAX_MESSAGE_SIZE} bytes")
+    return unpacked
+
+
+def _pack(data: Any) -> bytes:
+    try:
+        packed = msgpack.packb(data, use_bin_type=True)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise SerializationError(f"Failed to serialize: {e}") from e
+
+    if len(packed) > MAX_MESSAGE_SIZE:
+        raise SerializationError(
+            f"Message too large ({len(packed)} > {MAX_MESSAGE_SIZE})"
+        )
+    return packed
+
+
+def _unpack(data: bytes) -> Any:
     # Size check before unpacking
     if len(data) > MAX_MESSAGE_SIZE:
         raise ValidationError(
             f"Message too large ({len(data)} > {MAX_MESSAGE_SIZE})"
         )
 
+    if data.startswith(COMPRESSED_FRAME_PREFIX):
+        data = _decompress_frame(data)
+
     try:
         # Unpack with strict limits
-        unpacked = msgpack.unpackb(
+        return msgpack.unpackb(
             data,
             raw=False,  # Decode bytes to str
             strict_map_key=True,  # Only allow str/int keys
@@ -205,15 +406,6 @@ def deserialize_lww(data: bytes) -> LWWElementSet:
             ValueError) as e:
         raise SerializationError(f"Failed to deserialize: {e}") from e
 
-    # Validate schema
-    validate_lww_dict(unpacked, "LWWElementSet")
-
-    # Construct LWWElementSet
-    try:
-        return LWWElementSet.from_dict(unpacked)
-    except (TypeError, ValueError, KeyError) as e:
-        raise SerializationError(f"Failed to construct LWWElementSet: {e}") from e
-
 
 def validate_message_size(data: bytes) -> None:
     """
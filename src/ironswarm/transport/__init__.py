@@ -19,6 +19,15 @@ class Transport:
         """Send a message."""
         raise NotImplementedError
 
+    async def send_multi(self, node_id, socket, keys, state: dict[str, LWWElementSet]):
+        """Send several keys to one peer, combined into one message where supported."""
+        for key in keys:
+            await self.send(node_id, socket, key, state)
+
+    async def announce(self, node_id, socket, key, elements: LWWElementSet):
+        """Deliver a few entries to a peer, e.g. a departure tombstone."""
+        await self.send(node_id, socket, key, {key: elements})
+
     def close(self):
         """Close the transport."""
         raise NotImplementedError
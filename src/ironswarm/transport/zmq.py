@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import zmq
@@ -7,7 +8,12 @@ from ironswarm.lwwelementset import LWWElementSet
 from ironswarm.serialization import (
     SerializationError,
     ValidationError,
+    compress_frame,
+    deserialize_digest,
+    deserialize_keys,
     deserialize_lww,
+    serialize_digest,
+    serialize_keys,
     serialize_lww,
 )
 from ironswarm.transport import Transport
@@ -20,6 +26,23 @@ class ZMQTransport(Transport):
     DEFAULT_POLL_TIMEOUT_MS = 2000  # 2 seconds
     MAX_PORT_BIND_ATTEMPTS = 100
 
+    # Anti-entropy topics: "<key>_digest" asks a peer for what we are missing
+    # and what it wants; "<key>_push" delivers the wanted entries (no reply).
+    DIGEST_SUFFIX = "_digest"
+    PUSH_SUFFIX = "_push"
+    # "<key>_announce" is a push the receiver acknowledges with an empty reply,
+    # for entries that must land before we stop (e.g. a departure tombstone).
+    ANNOUNCE_SUFFIX = "_announce"
+
+    # Combined frames carry (key, payload) pairs for several keys in one message
+    MULTI_STATE = "*state"
+    MULTI_DIGEST = "*digest"
+    MULTI_PUSH = "*push"
+
+    # State frames for these keys carry bulky, repetitive JSON; compress them.
+    # Receivers detect compressed frames by prefix, whatever the key.
+    COMPRESSED_KEYS = frozenset({"metrics_snapshots"})
+
     def __init__(
         self,
         host: str,
@@ -51,6 +74,13 @@ class ZMQTransport(Transport):
 
         # Connection pool: track persistent connections to avoid churn
         self._connected_sockets: set[str] = set()
+        # Replies on the shared dealer are not tagged with their request, so
+        # concurrent sends take turns for the send/poll/recv exchange.
+        self._exchange_lock = asyncio.Lock()
+        # (kind, key) -> (set, epoch, frame) for the last frame built from it
+        self._frame_cache: dict[tuple[str, str], tuple[LWWElementSet, int, bytes]] = {}
+        # Peers that never answer combined frames (older releases); gossiped key by key
+        self._per_key_sockets: set[str] = set()
 
         # LINGER=0: Discard pending messages immediately on close
         # This is correct for distributed load testing where:
@@ -127,53 +157,331 @@ class ZMQTransport(Transport):
         self._running = False
 
     async def _listen(self, state: dict[str, LWWElementSet]):
-        (
-            sender_id,
-            _empty,
-            key,
-            received_data,
-        ) = await self.router.recv_multipart()
+        sender_id, _empty, key, *payload = await self.router.recv_multipart()
         log.debug(f"LISTEN: Received message from {sender_id.decode()}")
 
+        key_str = key.decode()
+        if key_str == self.MULTI_STATE:
+            await self._reply_to_multi_state(sender_id, key, payload, state)
+            return
+        if key_str == self.MULTI_DIGEST:
+            await self._reply_to_multi_digest(sender_id, key, payload, state)
+            return
+        if key_str == self.MULTI_PUSH:
+            for key_frame, data in zip(payload[0::2], payload[1::2]):
+                self._merge_push(sender_id, key_frame.decode(), data, state)
+            return
+
+        received_data = payload[0] if payload else b""
+        if key_str.endswith(self.DIGEST_SUFFIX):
+            delta, wanted = self._digest_reply(
+                sender_id, key_str.removesuffix(self.DIGEST_SUFFIX), received_data, state
+            )
+            await self.router.send_multipart([sender_id, b"", key, delta, wanted])
+            log.debug(f"LISTEN: replied to digest from {sender_id.decode()}")
+            return
+        if key_str.endswith(self.ANNOUNCE_SUFFIX):
+            await self.router.send_multipart([sender_id, b"", key])
+            self._merge_push(
+                sender_id, key_str.removesuffix(self.ANNOUNCE_SUFFIX), received_data, state
+            )
+            return
+        if key_str.endswith(self.PUSH_SUFFIX):
+            self._merge_push(
+                sender_id, key_str.removesuffix(self.PUSH_SUFFIX), received_data, state
+            )
+            return
+
+        serialized_message, received_set = self._state_reply(
+            sender_id, key_str, received_data, state
+        )
+        # Empty response indicates an error
+        await self.router.send_multipart([sender_id, b"", key, serialized_message])
+        log.debug(f"LISTEN: replied to {sender_id.decode()}")
+
+        # merge after reply to reduce b/w
+        if received_set is not None:
+            state[key_str].merge(received_set)
+
+    async def _reply_to_multi_state(
+        self, sender_id, key, payload, state: dict[str, LWWElementSet]
+    ):
+        """Answer a combined full-state frame with our state for each key in it."""
+        reply = [sender_id, b"", key]
+        received_sets = []
+        for key_frame, received_data in zip(payload[0::2], payload[1::2]):
+            key_str = key_frame.decode()
+            serialized_message, received_set = self._state_reply(
+                sender_id, key_str, received_data, state
+            )
+            reply += [key_frame, serialized_message]
+            if received_set is not None:
+                received_sets.append((key_str, received_set))
+
+        await self.router.send_multipart(reply)
+        log.debug(f"LISTEN: replied to {sender_id.decode()} for {len(received_sets)} keys")
+
+        # merge after reply to reduce b/w
+        for key_str, received_set in received_sets:
+            state[key_str].merge(received_set)
+
+    async def _reply_to_multi_digest(
+        self, sender_id, key, payload, state: dict[str, LWWElementSet]
+    ):
+        """Answer a combined digest frame with a (delta, wanted) pair per key."""
+        reply = [sender_id, b"", key]
+        for key_frame, received_data in zip(payload[0::2], payload[1::2]):
+            reply += [key_frame, *self._digest_reply(sender_id, key_frame.decode(), received_data, state)]
+
+        await self.router.send_multipart(reply)
+        log.debug(f"LISTEN: replied to combined digest from {sender_id.decode()}")
+
+    def _state_reply(self, sender_id, key_str, received_data, state: dict[str, LWWElementSet]):
+        """Return (our serialized state, their set), or (b"", None) on a bad message."""
         # Deserialize with validation
         try:
             received_set = deserialize_lww(received_data)
         except (SerializationError, ValidationError) as e:
             log.error(f"LISTEN: Invalid message from {sender_id.decode()}: {e}")
-            # Send empty response to indicate error
-            await self.router.send_multipart([sender_id, b"", key, b""])
-            return
-
-        key_str = key.decode()
+            return b"", None
 
         # Serialize our state
         try:
-            serialized_message = serialize_lww(state[key_str])
-        except SerializationError as e:
+            return self._encoded_state(key_str, state[key_str]), received_set
+        except (SerializationError, KeyError) as e:
             log.error(f"LISTEN: Failed to serialize state for {key_str}: {e}")
-            await self.router.send_multipart([sender_id, b"", key, b""])
+            return b"", None
+
+    def _digest_reply(self, sender_id, key_str, received_data, state: dict[str, LWWElementSet]):
+        """Return (entries the sender lacks, keys we want), or empty frames on error."""
+        try:
+            digest = deserialize_digest(received_data)
+            local = state[key_str]
+            delta = self._encode(key_str, serialize_lww(local.delta(digest)))
+            wanted = serialize_keys(local.newer_in(digest))
+        except (SerializationError, ValidationError, KeyError) as e:
+            log.error(f"LISTEN: Invalid digest from {sender_id.decode()}: {e}")
+            return b"", b""
+        return delta, wanted
+
+    def _merge_push(self, sender_id, key_str, received_data, state: dict[str, LWWElementSet]):
+        """Merge entries a peer pushed after asking for them in a digest reply."""
+        try:
+            state[key_str].merge(deserialize_lww(received_data))
+        except (SerializationError, ValidationError, KeyError) as e:
+            log.error(f"LISTEN: Invalid push from {sender_id.decode()}: {e}")
+
+    async def send(self, node_id, socket, key, state: dict[str, LWWElementSet]):
+        if socket in self._connected_sockets and key in state:
+            # Known peer: exchange digests and ship only what differs.
+            # First contact falls through to a full-state swap to bootstrap.
+            await self._sync_digest(node_id, socket, key, state)
             return
 
-        await self.router.send_multipart([sender_id, b"", key, serialized_message])
-        log.debug(f"LISTEN: replied to {sender_id.decode()}")
+        # Serialize our state before queueing for the shared dealer
+        try:
+            serialized_message = self._encoded_state(key, state[key])
+        except SerializationError as e:
+            log.error(f"SEND: Failed to serialize state for {key}: {e}")
+            return
 
-        # merge after reply to reduce b/w
-        state[key_str].merge(received_set)
+        async with self._exchange_lock:
+            self._connect(socket)
+            await self._swap_state(node_id, socket, key, state, serialized_message)
 
-    async def send(self, node_id, socket, key, state: dict[str, LWWElementSet]):
+    async def send_multi(self, node_id, socket, keys, state: dict[str, LWWElementSet]):
+        """Gossip several keys to one peer in a single combined exchange.
+
+        Peers from releases before combined frames drop them unanswered. When a
+        combined exchange times out, the keys are retried one by one, and the
+        peer is only evicted if that fails too; peers that answer per-key are
+        gossiped that way from then on.
+        """
+        keys = [key for key in keys if key in state]
+        if not keys:
+            return
+
+        if socket in self._per_key_sockets:
+            await self._send_per_key(node_id, socket, keys, state)
+            return
+
+        known = socket in self._connected_sockets
+        frames = []
+        for key in keys:
+            try:
+                if known:
+                    payload = self._encoded_digest(key, state[key])
+                else:
+                    payload = self._encoded_state(key, state[key])
+            except SerializationError as e:
+                log.error(f"SEND: Failed to serialize {key}: {e}")
+                continue
+            frames += [key.encode(), payload]
+        if not frames:
+            return
+
+        async with self._exchange_lock:
+            self._connect(socket)
+            if known:
+                answered = await self._exchange_multi_digest(node_id, socket, keys, state, frames)
+            else:
+                answered = await self._swap_multi_state(node_id, socket, keys, state, frames)
+
+        if not answered:
+            log.info(f"SEND: No combined reply from {node_id}, retrying key by key")
+            await self._send_per_key(node_id, socket, keys, state, full_state=not known)
+
+    async def _send_per_key(
+        self, node_id, socket, keys, state: dict[str, LWWElementSet], full_state=False
+    ):
+        for i, key in enumerate(keys):
+            if full_state:
+                # First contact: swap full state, as send() does for a new peer
+                try:
+                    serialized_message = self._encoded_state(key, state[key])
+                except SerializationError as e:
+                    log.error(f"SEND: Failed to serialize state for {key}: {e}")
+                    continue
+                async with self._exchange_lock:
+                    await self._swap_state(node_id, socket, key, state, serialized_message)
+            else:
+                await self._sync_digest(node_id, socket, key, state)
+            if socket not in self._connected_sockets:
+                # Dropped as unresponsive for this key; drop it for the rest too
+                for rest in keys[i + 1:]:
+                    state[rest].remove(node_id)
+                return
+        self._per_key_sockets.add(socket)
+
+    async def _swap_multi_state(
+        self, node_id, socket, keys, state: dict[str, LWWElementSet], frames
+    ) -> bool:
+        """Swap full state for several keys; False if the peer sent no valid reply."""
+        topic = self.MULTI_STATE.encode()
+        await self.dealer.send_multipart([b"", topic, *frames])
+        log.debug(f"SEND: {len(keys)} keys to {node_id} at {socket}")
+
+        reply = await self._recv_reply(topic)
+        if reply is None:
+            return False
+        payload = reply[2:]
+        # One (key, state) pair per key sent
+        if len(payload) != len(frames):
+            log.warning(f"SEND: Malformed combined state reply from {node_id}")
+            return False
+        try:
+            reply_keys = [key_frame.decode() for key_frame in payload[0::2]]
+        except UnicodeDecodeError as e:
+            log.error(f"SEND: Invalid combined state reply from {node_id}: {e}")
+            return True
+
+        for key, received_data in zip(reply_keys, payload[1::2]):
+            if key not in keys:
+                continue
+            if not received_data:
+                log.warning(f"SEND: Empty {key} response from {node_id}, likely validation error")
+                continue
+            try:
+                state[key].merge(deserialize_lww(received_data))
+            except (SerializationError, ValidationError) as e:
+                log.error(f"SEND: Invalid {key} response from {node_id}: {e}")
+        return True
+
+    async def _exchange_multi_digest(
+        self, node_id, socket, keys, state: dict[str, LWWElementSet], frames
+    ) -> bool:
+        """Digest round for several keys; False if the peer sent no valid reply."""
+        topic = self.MULTI_DIGEST.encode()
+        await self.dealer.send_multipart([b"", topic, *frames])
+        log.debug(f"SEND: {len(keys)} digests to {node_id} at {socket}")
+
+        reply = await self._recv_reply(topic)
+        if reply is None:
+            return False
+        payload = reply[2:]
+        # One (key, delta, wanted) triple per (key, digest) pair sent
+        if len(payload) != len(frames) // 2 * 3:
+            log.warning(f"SEND: Malformed combined digest reply from {node_id}")
+            return False
+        try:
+            reply_keys = [key_frame.decode() for key_frame in payload[0::3]]
+        except UnicodeDecodeError as e:
+            log.error(f"SEND: Invalid combined digest reply from {node_id}: {e}")
+            return True
+
+        push = []
+        for key, delta_data, wanted_data in zip(reply_keys, payload[1::3], payload[2::3]):
+            if key not in keys:
+                continue
+            if not delta_data:
+                log.warning(f"SEND: Empty {key} digest reply from {node_id}, likely validation error")
+                continue
+            try:
+                delta = deserialize_lww(delta_data)
+                wanted = deserialize_keys(wanted_data)
+            except (SerializationError, ValidationError) as e:
+                log.error(f"SEND: Invalid {key} digest reply from {node_id}: {e}")
+                continue
+
+            state[key].merge(delta)
+            if not wanted:
+                continue
+            try:
+                push += [key.encode(), self._encode(key, serialize_lww(state[key].subset(wanted)))]
+            except SerializationError as e:
+                log.error(f"SEND: Failed to serialize push for {key}: {e}")
+
+        if push:
+            await self.dealer.send_multipart([b"", self.MULTI_PUSH.encode(), *push])
+            log.debug(f"SEND: pushed {len(push) // 2} keys to {node_id}")
+        return True
+
+    async def _recv_reply(self, topic: bytes):
+        """Next reply tagged `topic` within the poll timeout, or None.
+
+        A reply to an earlier exchange that timed out can still arrive on the
+        shared dealer; it is discarded rather than read as this one.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.poll_timeout_ms / 1000
+        while True:
+            remaining_ms = max(0, round((deadline - loop.time()) * 1000))
+            if not await self.dealer.poll(remaining_ms):
+                return None
+            reply = await self.dealer.recv_multipart(zmq.NOBLOCK)
+            if len(reply) >= 2 and reply[1] == topic:
+                return reply
+            log.debug(f"SEND: Discarding stale reply while waiting for {topic.decode()}")
+
+    async def announce(self, node_id, socket, key, elements: LWWElementSet):
+        """Push `elements` to one peer and wait for its acknowledgement."""
+        try:
+            payload = self._encode(key, serialize_lww(elements))
+        except SerializationError as e:
+            log.error(f"SEND: Failed to serialize {key} announcement: {e}")
+            return
+
+        async with self._exchange_lock:
+            self._connect(socket)
+            await self.dealer.send_multipart(
+                [b"", f"{key}{self.ANNOUNCE_SUFFIX}".encode(), payload]
+            )
+            if await self.dealer.poll(self.poll_timeout_ms):
+                await self.dealer.recv_multipart(zmq.NOBLOCK)
+                log.debug(f"SEND: {node_id} acknowledged {key} announcement")
+            else:
+                log.warning(f"SEND: No acknowledgement from {node_id} at {socket}")
+
+    def _connect(self, socket):
         # Use connection pooling - only connect if not already connected
         if socket not in self._connected_sockets:
             self.dealer.connect(socket)
             self._connected_sockets.add(socket)
             log.debug(f"SEND: New connection to {socket}")
 
-        # Serialize our state
-        try:
-            serialized_message = serialize_lww(state[key])
-        except SerializationError as e:
-            log.error(f"SEND: Failed to serialize state for {key}: {e}")
-            return
-
+    async def _swap_state(
+        self, node_id, socket, key, state: dict[str, LWWElementSet], serialized_message
+    ):
         await self.dealer.send_multipart([b"", key.encode(), serialized_message])
         log.debug(f"SEND: to {node_id} at {socket}")
 
@@ -194,13 +502,90 @@ class ZMQTransport(Transport):
                 except (SerializationError, ValidationError) as e:
                     log.error(f"SEND: Invalid response from {node_id}: {e}")
         else:
-            log.warning(f"SEND: No response from {node_id} at {socket}")
-            log.warning(f"Failed to swap {key} with {socket}, removing from state?")
+            self._drop_unresponsive(node_id, socket, [key], state)
+
+    async def _sync_digest(self, node_id, socket, key, state: dict[str, LWWElementSet]):
+        """Push/pull anti-entropy round for one key with a known peer."""
+        try:
+            digest = self._encoded_digest(key, state[key])
+        except SerializationError as e:
+            log.error(f"SEND: Failed to serialize digest for {key}: {e}")
+            return
+
+        async with self._exchange_lock:
+            self._connect(socket)
+            await self._exchange_digest(node_id, socket, key, state, digest)
+
+    async def _exchange_digest(
+        self, node_id, socket, key, state: dict[str, LWWElementSet], digest
+    ):
+        await self.dealer.send_multipart([b"", f"{key}{self.DIGEST_SUFFIX}".encode(), digest])
+        log.debug(f"SEND: digest to {node_id} at {socket}")
+
+        _event = await self.dealer.poll(self.poll_timeout_ms)
+        if not _event:
+            self._drop_unresponsive(node_id, socket, [key], state)
+            return
+
+        frames = await self.dealer.recv_multipart(zmq.NOBLOCK)
+        if len(frames) != 4 or not frames[2]:
+            log.warning(f"SEND: Empty digest reply from {node_id}, likely validation error")
+            return
+
+        _empty, _key, delta_data, wanted_data = frames
+        try:
+            delta = deserialize_lww(delta_data)
+            wanted = deserialize_keys(wanted_data)
+        except (SerializationError, ValidationError) as e:
+            log.error(f"SEND: Invalid digest reply from {node_id}: {e}")
+            return
+
+        state[key].merge(delta)
+        if not wanted:
+            return
+
+        try:
+            push = self._encode(key, serialize_lww(state[key].subset(wanted)))
+        except SerializationError as e:
+            log.error(f"SEND: Failed to serialize push for {key}: {e}")
+            return
+        await self.dealer.send_multipart([b"", f"{key}{self.PUSH_SUFFIX}".encode(), push])
+        log.debug(f"SEND: pushed {len(wanted)} {key} entries to {node_id}")
+
+    def _encoded_state(self, key, lww: LWWElementSet) -> bytes:
+        """Full-state frame for `key`, re-serialized only after the set changes."""
+        return self._cached_frame(
+            ("state", key), lww, lambda: self._encode(key, serialize_lww(lww))
+        )
+
+    def _encoded_digest(self, key, lww: LWWElementSet) -> bytes:
+        """Digest frame for `key`, re-serialized only after the set changes."""
+        return self._cached_frame(("digest", key), lww, lambda: serialize_digest(lww.digest()))
+
+    def _cached_frame(self, slot, lww: LWWElementSet, build) -> bytes:
+        # Every neighbour in a round (and every listener reply) sees the same
+        # set, so frames are reused until its epoch moves.
+        cached = self._frame_cache.get(slot)
+        if cached is not None and cached[0] is lww and cached[1] == lww.epoch:
+            return cached[2]
+        frame = build()
+        self._frame_cache[slot] = (lww, lww.epoch, frame)
+        return frame
+
+    def _encode(self, key, payload):
+        return compress_frame(payload) if key in self.COMPRESSED_KEYS else payload
+
+    def _drop_unresponsive(self, node_id, socket, keys, state: dict[str, LWWElementSet]):
+        log.warning(f"SEND: No response from {node_id} at {socket}")
+        log.warning(f"Failed to swap {', '.join(keys)} with {socket}, removing from state?")
+        for key in keys:
             state[key].remove(node_id)
-            # Disconnect failed socket and remove from pool
-            self.dealer.disconnect(socket)
-            self._connected_sockets.discard(socket)
-            log.debug(f"SEND: Disconnected failed socket {socket}")
+        # Disconnect failed socket and remove from pool
+        self.dealer.disconnect(socket)
+        self._connected_sockets.discard(socket)
+        # It may come back upgraded; try combined frames again on reconnect
+        self._per_key_sockets.discard(socket)
+        log.debug(f"SEND: Disconnected failed socket {socket}")
 
     def close(self):
         log.debug("Closing ZMQTransport...")
@@ -138,7 +138,7 @@ async def post_scenario(request: web.Request) -> web.Response:
             }, status=400)
 
         # Check if scenario is already running
-        if "scenarios" in node.state and scenario_spec in node.state["scenarios"].keys():
+        if "scenarios" in node.state and scenario_spec in node.state["scenarios"]:
             return json_response({
                 "error": f"Scenario {scenario_spec} is already running",
             }, status=409)
@@ -192,11 +192,11 @@ async def delete_scenario(request: web.Request) -> web.Response:
                         break
 
         # Remove from CRDT state
-        if "scenarios" in node.state and scenario_id in node.state["scenarios"].keys():
+        if "scenarios" in node.state and scenario_id in node.state["scenarios"]:
             node.state["scenarios"].remove(scenario_id)
             await node.update_neighbours()
 
-        if scenario_stopped or scenario_id not in node.state.get("scenarios", {}).keys():
+        if scenario_stopped or scenario_id not in node.state.get("scenarios", {}):
             return json_response({
                 "status": "stopped",
                 "scenario_id": scenario_id,
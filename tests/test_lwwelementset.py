@@ -61,3 +61,68 @@ def test_lwwelementset_values():
     values = lww.values()
     assert ("apple", {"timestamp": 100, "node": "A"}) in values
     assert ("banana", {"timestamp": 200, "node": "B"}) not in values
+
+
+def test_lwwelementset_digest_delta_round_trip():
+    ours = LWWElementSet()
+    theirs = LWWElementSet()
+    ours.add("apple", timestamp=100, node="A")
+    ours.add("pear", timestamp=300, node="A")
+    theirs.add("pear", timestamp=200, node="B")
+    theirs.add("plum", timestamp=150, node="B")
+    theirs.remove("apple", timestamp=400)
+
+    # Only entries newer than the peer's digest travel
+    delta = ours.delta(theirs.digest())
+    assert delta.to_dict() == {
+        "add_set": {"apple": {"timestamp": 100, "node": "A"}, "pear": {"timestamp": 300, "node": "A"}},
+        "remove_set": {},
+    }
+    assert sorted(ours.newer_in(theirs.digest())) == ["apple", "plum"]
+
+    # A digest/push round leaves both sides converged
+    theirs.merge(delta)
+    ours.merge(theirs.subset(ours.newer_in(theirs.digest())))
+    assert ours.to_dict() == theirs.to_dict()
+    assert ours.keys() == {"pear", "plum"}
+
+
+def test_lwwelementset_epoch_tracks_changes():
+    lww = LWWElementSet()
+    lww.add("apple", timestamp=100, node="A")
+    epoch = lww.epoch
+
+    # Re-merging identical or older entries leaves the epoch alone
+    lww.merge(LWWElementSet.from_dict(lww.to_dict()))
+    lww.add("apple", timestamp=50)
+    assert lww.epoch == epoch
+
+    lww.remove("apple", timestamp=200)
+    assert lww.epoch == epoch + 1
+
+
+def test_lwwelementset_views_follow_changes():
+    lww = LWWElementSet()
+    lww.add("apple", timestamp=100)
+    keys = lww.keys()
+    keys.add("mutated")
+
+    # Callers get copies, and the cached view is rebuilt after a write
+    assert lww.keys() == {"apple"}
+    lww.add("pear", timestamp=100)
+    lww.remove("apple", timestamp=200)
+    assert lww.keys() == {"pear"}
+    assert [e for e, _ in lww.values()] == ["pear"]
+
+
+def test_lwwelementset_contains_and_len():
+    lww = LWWElementSet()
+    lww.add("apple", timestamp=100)
+    lww.add("pear", timestamp=100)
+    lww.remove("pear", timestamp=200)
+
+    assert "apple" in lww
+    assert "pear" not in lww
+    assert "plum" not in lww
+    assert len(lww) == 1
+    assert "plum" not in lww.add_set
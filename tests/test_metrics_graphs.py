@@ -1,13 +1,27 @@
 import importlib
+import json
 
+import numpy as np
 import pytest
 
 from ironswarm.metrics.graphs import (
+    _GRADIENT_PATCH_BUDGET,
+    _close_cached_figures,
+    _endpoint_label,
+    _format_endpoint_label,
+    _extract_event_arrays,
+    _load_event_arrays,
+    _load_snapshot_source,
+    _latency_stats,
     _latency_timeseries,
     _stacked_series_data,
+    _theme_figure,
+    _use_gradients,
     generate_graphs,
 )
 
+from ironswarm.metrics_snapshot import append_snapshot_record, snapshot_log_path
+
 HAVE_MPL = importlib.util.find_spec("matplotlib") is not None
 
 
@@ -36,7 +50,8 @@ def _snapshot():
 
 def test_latency_timeseries_percentiles():
     snapshot = _snapshot()
-    series = _latency_timeseries(snapshot["events"]["http_request"], bin_seconds=1)
+    events = _extract_event_arrays(snapshot["events"]["http_request"])
+    series = _latency_timeseries(events, bin_seconds=1)
 
     assert len(series) == 5
     # First bucket should have single duration 0.1
@@ -45,10 +60,58 @@ def test_latency_timeseries_percentiles():
     assert series[-1]["p99"] == pytest.approx(0.5)
 
 
+@pytest.mark.parametrize("count", [500, 5000])
+def test_latency_timeseries_matches_numpy_quantile(count):
+    # 500 events take the global sort; 5000 fill buckets enough to partition.
+    rng = np.random.default_rng(7)
+    events = [
+        {"timestamp": 1_700_000_000 + float(ts), "duration": float(dur), "labels": {}}
+        for ts, dur in zip(rng.uniform(0, 10, count), rng.exponential(0.2, count))
+    ]
+    series = _latency_timeseries(_extract_event_arrays(events), bin_seconds=2)
+
+    for entry in series:
+        durations = [
+            e["duration"]
+            for e in events
+            if entry["time"] <= e["timestamp"] < entry["time"] + 2
+        ]
+        expected = np.quantile(durations, [0.5, 0.95, 0.99], method="linear")
+        assert [entry["p50"], entry["p95"], entry["p99"]] == pytest.approx(expected)
+
+
+def test_latency_stats_reads_quantiles_from_cumulative_buckets():
+    snapshot = {
+        "histograms": {
+            "ironswarm_http_request_duration_seconds": {
+                "samples": [
+                    {
+                        "labels": {"method": "GET", "host": "api", "path": "/a"},
+                        "count": 100,
+                        "sum": 12.0,
+                        "buckets": [
+                            {"le": 0.05, "count": 40},
+                            {"le": 0.1, "count": 50},
+                            {"le": 0.5, "count": 97},
+                            {"le": 1.0, "count": 99},
+                            {"le": "+Inf", "count": 100},
+                        ],
+                    },
+                    {"labels": {"path": "/idle"}, "count": 0, "sum": 0.0, "buckets": []},
+                ]
+            }
+        }
+    }
+    (stats,) = _latency_stats(snapshot, limit=5)
+
+    assert stats["label"] == "GET api/a"
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (0.1, 0.5, 1.0)
+
+
 def test_stacked_series_data_groups_by_endpoint():
     snapshot = _snapshot()
     times, labels, series = _stacked_series_data(
-        snapshot["events"]["http_request"],
+        _extract_event_arrays(snapshot["events"]["http_request"]),
         bin_seconds=1,
         limit=2,
     )
@@ -60,6 +123,118 @@ def test_stacked_series_data_groups_by_endpoint():
     assert total == len(snapshot["events"]["http_request"])
 
 
+def test_endpoint_label_cache_is_bounded():
+    _format_endpoint_label.cache_clear()
+    for i in range(_format_endpoint_label.cache_info().maxsize + 10):
+        _endpoint_label({"method": "GET", "host": "h", "path": f"/item/{i}"})
+
+    info = _format_endpoint_label.cache_info()
+    assert info.currsize == info.maxsize
+    assert _endpoint_label({"path": ""}) == "GET /"
+
+
+def test_stacked_series_data_keeps_top_endpoints_in_order():
+    events = [
+        {"timestamp": 1_700_000_000 + i, "labels": {"path": path}}
+        for i, path in enumerate(["/c", "/a", "/b", "/a", "/c", "/d", "/a"])
+    ]
+    arrays = _extract_event_arrays(events)
+
+    # "/b" and "/d" tie on one hit each; the label seen first wins.
+    assert _stacked_series_data(arrays, bin_seconds=1, limit=2)[1] == ["GET /a", "GET /c"]
+    assert _stacked_series_data(arrays, bin_seconds=1, limit=3)[1] == [
+        "GET /a",
+        "GET /c",
+        "GET /b",
+    ]
+
+
+def test_extract_event_arrays_skips_untimed_events_and_masks_errors():
+    events = _snapshot()["events"]["http_request"]
+    events.append({"duration": 0.2, "labels": {"status": "503"}})
+    events.append({"timestamp": 1_700_000_010, "labels": {"status": "404"}})
+    arrays = _extract_event_arrays(events)
+
+    assert len(arrays.timestamp) == 6
+    assert arrays.labels[:2] == [
+        "GET api.example.com/health",
+        "POST api.example.com/login",
+    ]
+    # Events without a duration still count towards throughput/errors.
+    assert len(_latency_timeseries(arrays, bin_seconds=1)) == 5
+
+    errors = _stacked_series_data(arrays, bin_seconds=1, limit=10, mask=arrays.status >= 400)
+    assert errors[1] == ["POST api.example.com/login", "GET /"]
+    # Only buckets holding an error are kept on the time axis.
+    assert [sum(values) for values in zip(*errors[2])] == [1, 1]
+
+
+def test_load_event_arrays_reads_snapshot_file(tmp_path):
+    snapshot = _snapshot()
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps(snapshot))
+
+    arrays = _load_event_arrays(path)
+    expected = _extract_event_arrays(snapshot["events"]["http_request"])
+
+    for key in ("timestamp", "duration", "status", "label_id"):
+        assert np.array_equal(getattr(arrays, key), getattr(expected, key), equal_nan=True)
+    assert arrays.labels == expected.labels
+
+
+def test_load_snapshot_source_merges_histograms_across_files(tmp_path):
+    def fragment(path, count, buckets):
+        return {
+            "histograms": {
+                "ironswarm_http_request_duration_seconds": {
+                    "samples": [
+                        {
+                            "labels": {"method": "GET", "path": path},
+                            "count": count,
+                            "sum": 0.1 * count,
+                            "buckets": buckets,
+                        }
+                    ]
+                }
+            }
+        }
+
+    fragments = [
+        fragment("/a", 2, [{"le": "0.1", "count": 1}, {"le": "+Inf", "count": 2}]),
+        fragment("/a", 3, [{"le": "0.5", "count": 2}, {"le": "+Inf", "count": 3}]),
+        fragment("/b", 1, [{"le": "+Inf", "count": 1}]),
+    ]
+    for idx, data in enumerate(fragments[:2]):
+        (tmp_path / f"metrics_{idx}.json").write_text(json.dumps(data))
+    # Nodes append later snapshots to hourly logs in their metrics directory
+    node_dir = tmp_path / "node"
+    node_dir.mkdir()
+    append_snapshot_record(snapshot_log_path(node_dir, 7200), 7200, json.dumps(fragments[2]))
+
+    merged = _load_snapshot_source(tmp_path)
+    samples = merged["histograms"]["ironswarm_http_request_duration_seconds"]["samples"]
+
+    assert [s["labels"]["path"] for s in samples] == ["/a", "/b"]
+    assert samples[0]["count"] == 5
+    assert samples[0]["buckets"] == [
+        {"le": "0.1", "count": 1},
+        {"le": "0.5", "count": 2},
+        {"le": "+Inf", "count": 5},
+    ]
+
+
+def test_use_gradients_respects_budget_and_style(monkeypatch):
+    monkeypatch.delenv("IRONSWARM_GRAPH_STYLE", raising=False)
+    assert _use_gradients(_GRADIENT_PATCH_BUDGET)
+    assert not _use_gradients(_GRADIENT_PATCH_BUDGET + 1)
+
+    monkeypatch.setenv("IRONSWARM_GRAPH_STYLE", "flat")
+    assert not _use_gradients(1)
+
+    monkeypatch.setenv("IRONSWARM_GRAPH_STYLE", "rich")
+    assert _use_gradients(_GRADIENT_PATCH_BUDGET + 1)
+
+
 @pytest.mark.skipif(not HAVE_MPL, reason="matplotlib not installed")
 def test_generate_graphs_writes_files(tmp_path):
     snapshot = _snapshot()
@@ -68,3 +243,52 @@ def test_generate_graphs_writes_files(tmp_path):
     assert len(files) >= 2
     for file in files:
         assert file.exists()
+
+
+@pytest.mark.skipif(not HAVE_MPL, reason="matplotlib not installed")
+def test_generate_graphs_supports_alternate_formats(tmp_path):
+    snapshot = _snapshot()
+    files = generate_graphs(snapshot, tmp_path, limit=5, bin_seconds=1, image_format="webp", dpi=80)
+
+    assert files
+    assert all(file.suffix == ".webp" and file.exists() for file in files)
+
+    with pytest.raises(ValueError):
+        generate_graphs(snapshot, tmp_path, image_format="bmp")
+
+
+@pytest.mark.skipif(not HAVE_MPL, reason="matplotlib not installed")
+def test_generate_graphs_renders_in_worker_processes(tmp_path):
+    serial = generate_graphs(_snapshot(), tmp_path / "serial", limit=5, bin_seconds=1)
+    parallel = generate_graphs(
+        _snapshot(), tmp_path / "parallel", limit=5, bin_seconds=1, workers=3
+    )
+
+    assert [file.name for file in parallel] == [file.name for file in serial]
+    for ours, theirs in zip(serial, parallel):
+        assert ours.read_bytes() == theirs.read_bytes()
+
+
+@pytest.mark.skipif(not HAVE_MPL, reason="matplotlib not installed")
+def test_theme_figure_reuses_cached_figures():
+    fig, _ = _theme_figure((12, 5))
+    reused, _ = _theme_figure((12, 5))
+
+    assert reused is fig
+    assert len(reused.axes) == 1
+    _close_cached_figures()
+
+
+@pytest.mark.skipif(not HAVE_MPL, reason="matplotlib not installed")
+def test_generate_graphs_releases_cached_figures(tmp_path):
+    import matplotlib.pyplot as plt
+
+    fig, _ = _theme_figure((12, 5))
+    files = generate_graphs(_snapshot(), tmp_path, limit=5, bin_seconds=1)
+    fresh, _ = _theme_figure((12, 5))
+
+    assert fresh is not fig
+    assert plt.get_fignums() == []
+    for file in files:
+        assert file.exists()
+    _close_cached_figures()
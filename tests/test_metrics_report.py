@@ -1,4 +1,11 @@
-from ironswarm.metrics.report import format_report, summarize_snapshot
+import json
+
+from ironswarm.metrics.report import (
+    _group_counter_samples,
+    format_report,
+    load_snapshot,
+    summarize_snapshot,
+)
 
 
 def _sample_snapshot():
@@ -93,3 +100,24 @@ def test_format_report_contains_header_and_summary():
 
     assert "Ironswarm Metrics Report" in report
     assert "Journeys:" in report
+
+
+def test_load_snapshot_accepts_non_finite_values(tmp_path):
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps({"histograms": {"latency": {"max": float("inf")}}}))
+
+    snapshot = load_snapshot(path)
+
+    assert snapshot["histograms"]["latency"]["max"] == float("inf")
+
+
+def test_group_counter_samples_limits_to_largest_groups():
+    snapshot = _sample_snapshot()
+    keys = ("method", "host", "path")
+
+    grouped = _group_counter_samples(snapshot, "ironswarm_http_requests_total", keys)
+    top = _group_counter_samples(snapshot, "ironswarm_http_requests_total", keys, limit=1)
+
+    assert [value for value, _ in grouped] == [50, 20]
+    assert top == grouped[:1]
+    assert top[0][1] == {"method": "GET", "host": "api.example.com", "path": "/health"}
@@ -5,6 +5,7 @@ Tests the gossip-based metrics snapshot sharing across multiple nodes.
 """
 
 import json
+import os
 import tempfile
 from pathlib import Path
 from time import time
@@ -14,8 +15,16 @@ import pytest
 
 from ironswarm.metrics.collector import collector
 from ironswarm.metrics import aggregator
-from ironswarm.metrics_snapshot import MetricsSnapshot
+from ironswarm.metrics_snapshot import (
+    MetricsSnapshot,
+    append_snapshot_record,
+    dumps_snapshot_data,
+    iter_snapshot_records,
+    loads_snapshot_data,
+    snapshot_log_path,
+)
 from ironswarm.node import Node
+from ironswarm.serialization import MAX_STRING_LENGTH
 
 
 @pytest.fixture
@@ -26,6 +35,8 @@ def mock_transport():
     transport.port = 42042
     transport.listen = AsyncMock()
     transport.send = AsyncMock()
+    transport.send_multi = AsyncMock()
+    transport.announce = AsyncMock()
     transport.bind = MagicMock()
     return transport
 
@@ -82,6 +93,46 @@ async def test_metrics_snapshot_expiration():
     assert not snapshot.is_expired(10800)
 
 
+def test_metrics_snapshot_hash_identity():
+    """Snapshots hash and compare on node identity and timestamp only."""
+    first = MetricsSnapshot(node_identity="node", timestamp=100, snapshot_data={"a": 1})
+    same_key = MetricsSnapshot(node_identity="node", timestamp=100, snapshot_data={})
+    later = MetricsSnapshot(node_identity="node", timestamp=101, snapshot_data={"a": 1})
+
+    assert hash(first) == hash(same_key) == hash(("node", 100))
+    assert {first, same_key, later} == {first, later}
+    assert "_hash" not in repr(first)
+    assert not hasattr(first, "__dict__")
+
+
+def test_snapshot_data_json_round_trip():
+    """dumps_snapshot_data/loads_snapshot_data round-trip and read json.dumps output."""
+    snapshot_data = {"counters": {"requests": {"samples": [{"labels": {}, "value": 3}]}}}
+
+    encoded = dumps_snapshot_data(snapshot_data)
+
+    assert isinstance(encoded, str)
+    assert loads_snapshot_data(encoded) == snapshot_data
+    assert loads_snapshot_data(encoded.encode()) == snapshot_data
+    # Files written by the stdlib encoder may contain non-finite literals.
+    assert loads_snapshot_data(json.dumps({"max": float("inf")})) == {"max": float("inf")}
+
+
+def test_append_snapshot_record_after_torn_write(tmp_path):
+    """An append after a torn write drops the partial record instead of burying it."""
+    path = tmp_path / "metrics_0.log"
+    append_snapshot_record(path, 1, '{"t": 1}')
+    intact_size = path.stat().st_size
+    # A writer that died mid-record leaves a partial header behind
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02")
+
+    append_snapshot_record(path, 2, '{"t": 2}')
+
+    assert list(iter_snapshot_records(path)) == [(1, '{"t": 1}'), (2, '{"t": 2}')]
+    assert path.stat().st_size == 2 * intact_size
+
+
 @pytest.mark.asyncio
 async def test_metrics_aggregation():
     """Test aggregating snapshots from multiple nodes."""
@@ -236,12 +287,13 @@ async def test_snapshot_persistence(mock_transport):
         for i in range(3):
             node_id = f"node_{i}"
             if node_id != node.identity:
-                snapshot_file = metrics_base / node_id / f"metrics_{timestamp}.json"
+                snapshot_file = snapshot_log_path(metrics_base / node_id, timestamp)
                 assert snapshot_file.exists()
 
                 # Verify content
-                data = json.loads(snapshot_file.read_text())
-                assert data["node_identity"] == node_id
+                [(record_timestamp, record_json)] = iter_snapshot_records(snapshot_file)
+                assert record_timestamp == timestamp
+                assert json.loads(record_json)["node_identity"] == node_id
 
         # Create a new node that will load snapshots
         transport2 = MagicMock()
@@ -249,6 +301,8 @@ async def test_snapshot_persistence(mock_transport):
         transport2.port = 42043
         transport2.listen = AsyncMock()
         transport2.send = AsyncMock()
+        transport2.send_multi = AsyncMock()
+        transport2.announce = AsyncMock()
         transport2.bind = MagicMock()
 
         node2 = Node(
@@ -378,6 +432,8 @@ async def test_shared_filesystem_detection(mock_transport):
         transport2.port = 42043
         transport2.listen = AsyncMock()
         transport2.send = AsyncMock()
+        transport2.send_multi = AsyncMock()
+        transport2.announce = AsyncMock()
         transport2.bind = MagicMock()
 
         node2 = Node(
@@ -399,6 +455,36 @@ async def test_shared_filesystem_detection(mock_transport):
         assert node1.identity in node2._shared_fs_peers
 
 
+@pytest.mark.asyncio
+async def test_shared_filesystem_detection_rescans_on_directory_change(mock_transport):
+    """Peer detection reuses its last scan until the metrics base directory changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        node = Node(
+            host="local",
+            port=42042,
+            transport=mock_transport,
+            metrics_dir=tmpdir,
+        )
+        await node.bind()
+
+        metrics_base = Path(tmpdir)
+        (metrics_base / "peer_a").mkdir()
+        settled = time() - 60
+        os.utime(metrics_base, (settled, settled))
+
+        assert node._detect_shared_filesystem_peers() == {"peer_a"}
+        assert node._peer_scan is not None
+
+        # Unchanged mtime: the cached scan is returned without listing the directory.
+        (metrics_base / "peer_a").rmdir()
+        os.utime(metrics_base, (settled, settled))
+        assert node._detect_shared_filesystem_peers() == {"peer_a"}
+
+        # Adding a directory moves the mtime and forces a rescan.
+        (metrics_base / "peer_b").mkdir()
+        assert node._detect_shared_filesystem_peers() == {"peer_b"}
+
+
 @pytest.mark.asyncio
 async def test_gossip_skip_for_local_peers(mock_transport):
     """Test that nodes skip gossiping to local filesystem peers."""
@@ -418,6 +504,8 @@ async def test_gossip_skip_for_local_peers(mock_transport):
         transport2.port = 42043
         transport2.listen = AsyncMock()
         transport2.send = AsyncMock()
+        transport2.send_multi = AsyncMock()
+        transport2.announce = AsyncMock()
         transport2.bind = MagicMock()
 
         node2 = Node(
@@ -442,21 +530,17 @@ async def test_gossip_skip_for_local_peers(mock_transport):
         # Call update_neighbours
         await node1.update_neighbours()
 
-        # Check that transport.send was called for node_register and scenarios,
+        # Check that node_register and scenarios were gossiped,
         # but verify metrics_snapshots is NOT sent to local peer
-        send_calls = [call[0] for call in mock_transport.send.call_args_list]
+        sent = {call.args[0]: call.args[2] for call in mock_transport.send_multi.call_args_list}
 
         # Should have sent node_register and scenarios
-        assert any("node_register" in str(call) for call in send_calls)
-        assert any("scenarios" in str(call) for call in send_calls)
+        assert "node_register" in sent[node2.identity]
+        assert "scenarios" in sent[node2.identity]
 
         # If node2 is in shared_fs_peers, metrics_snapshots should not be sent
         if node2.identity in node1._shared_fs_peers:
-            # Count metrics_snapshots sends
-            metrics_calls = [call for call in mock_transport.send.call_args_list
-                           if len(call[0]) >= 3 and call[0][2] == "metrics_snapshots"]
-            # Should be 0 or only to non-local peers
-            assert len(metrics_calls) == 0
+            assert "metrics_snapshots" not in sent[node2.identity]
 
 
 @pytest.mark.asyncio
@@ -513,3 +597,216 @@ async def test_peer_snapshot_save_skip_local(mock_transport):
 
         # Should NOT have saved anything (skipped local peer)
         assert saved_count == 0
+
+
+@pytest.mark.asyncio
+async def test_peer_snapshot_save_loop_decodes_each_snapshot_once(mock_transport, monkeypatch):
+    """Test that peer_snapshot_save_loop only decodes snapshots it has not persisted yet."""
+    import asyncio
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        node = Node(
+            host="local",
+            port=42042,
+            transport=mock_transport,
+            metrics_dir=tmpdir,
+        )
+        node.running = True
+
+        peer_id = "remote_peer_456"
+        timestamp = int(time())
+        snapshot_key = f"{peer_id}:{timestamp}"
+        node.state["metrics_snapshots"].add(
+            snapshot_key,
+            timestamp=timestamp,
+            node_identity=peer_id,
+            snapshot_json=json.dumps({"timestamp": timestamp, "counters": {}}),
+        )
+
+        decoded = []
+        original = Node._snapshot_from_metadata
+
+        def counting_decode(self, key, metadata):
+            decoded.append(key)
+            return original(self, key, metadata)
+
+        monkeypatch.setattr(Node, "_snapshot_from_metadata", counting_decode)
+
+        sleeps = 0
+
+        async def fake_sleep(_seconds):
+            nonlocal sleeps
+            sleeps += 1
+            if sleeps > 2:
+                raise asyncio.CancelledError
+
+        monkeypatch.setattr("ironswarm.node.asyncio.sleep", fake_sleep)
+
+        with pytest.raises(asyncio.CancelledError):
+            await node.peer_snapshot_save_loop()
+
+        assert decoded == [snapshot_key]
+        assert snapshot_key in node._persisted_snapshot_keys
+        assert snapshot_log_path(Path(tmpdir) / peer_id, timestamp).exists()
+
+        # A removal gossiped in from a peer drops the key on the next pass
+        node.state["metrics_snapshots"].remove(snapshot_key, timestamp=time() + 1)
+        sleeps = 0
+        with pytest.raises(asyncio.CancelledError):
+            await node.peer_snapshot_save_loop()
+        assert node._persisted_snapshot_keys == set()
+
+
+def test_read_snapshots_from_disk_compacts_legacy_json(mock_transport):
+    """Test that legacy JSON files are re-encoded compactly and bad files counted as errors."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        node = Node(
+            host="local",
+            port=42042,
+            transport=mock_transport,
+            metrics_dir=tmpdir,
+        )
+        peer_dir = Path(tmpdir) / "peer"
+        peer_dir.mkdir()
+        now = int(time())
+        snapshot_data = {"counters": {}, "histograms": {}}
+        (peer_dir / f"metrics_{now}.json").write_text(json.dumps(snapshot_data, indent=2))
+        (peer_dir / f"metrics_{now - 1}.json").write_text("{not json")
+        oversized = {"counters": {"x": "y" * MAX_STRING_LENGTH}}
+        (peer_dir / f"metrics_{now - 2}.json").write_text(json.dumps(oversized))
+        (peer_dir / f"metrics_{now - node.metrics_snapshot_ttl_seconds - 60}.json").write_text("{}")
+        (peer_dir / "metrics_latest.json").write_text("{}")
+        (peer_dir / "notes.txt").write_text("ignored")
+
+        loaded, error_count = node._read_snapshots_from_disk()
+
+        assert loaded == [("peer", now, dumps_snapshot_data(snapshot_data))]
+        assert "\n" not in loaded[0][2]
+        # The corrupt file, the oversized snapshot and metrics_latest.json
+        assert error_count == 3
+
+
+def test_get_snapshots_from_crdt_decodes_each_key_once(mock_transport, monkeypatch):
+    """Test that decoded snapshots are cached per key and dropped once removed."""
+    node = Node(host="local", port=42042, transport=mock_transport)
+    timestamp = int(time())
+    for peer in ("a", "b"):
+        node.state["metrics_snapshots"].add(
+            f"{peer}:{timestamp}",
+            timestamp=timestamp,
+            node_identity=peer,
+            snapshot_json=json.dumps({"counters": {}}),
+        )
+
+    decoded = []
+    original = Node._snapshot_from_metadata
+    monkeypatch.setattr(
+        Node, "_snapshot_from_metadata", lambda self, key, meta: decoded.append(key) or original(self, key, meta)
+    )
+
+    first = node._get_snapshots_from_crdt()
+    second = node._get_snapshots_from_crdt()
+
+    assert len(first) == 2
+    assert [a is b for a, b in zip(first, second)] == [True, True]
+    assert sorted(decoded) == [f"a:{timestamp}", f"b:{timestamp}"]
+
+    node.state["metrics_snapshots"].remove(f"a:{timestamp}", timestamp=time() + 1)
+    assert [s.node_identity for s in node._get_snapshots_from_crdt()] == ["b"]
+    assert list(node._snapshot_cache) == [f"b:{timestamp}"]
+
+
+def test_recent_snapshots_follow_index_order(mock_transport):
+    """Test that the recent window comes back sorted and filtered without a full sort."""
+    node = Node(host="local", port=42042, transport=mock_transport)
+    now = int(time())
+    entries = [("b", now - 5), ("a", now - 5), ("a", now - 20), ("c", now - 7200), ("b", now - 1)]
+    for peer, timestamp in entries:
+        node.state["metrics_snapshots"].add(
+            f"{peer}:{timestamp}",
+            timestamp=timestamp,
+            node_identity=peer,
+            snapshot_json="{}",
+        )
+
+    recent = node._get_recent_snapshots_for_node()
+    assert [(s.node_identity, s.timestamp) for s in recent] == [
+        ("a", now - 20),
+        ("a", now - 5),
+        ("b", now - 5),
+        ("b", now - 1),
+    ]
+    assert recent == sorted(recent)
+    assert [s.timestamp for s in node._get_recent_snapshots_for_node("b")] == [now - 5, now - 1]
+
+    node.state["metrics_snapshots"].remove(f"a:{now - 5}", timestamp=time() + 1)
+    assert [(s.node_identity, s.timestamp) for s in node._get_recent_snapshots_for_node("a")] == [
+        ("a", now - 20)
+    ]
+    assert len(node._snapshot_index) == len(node._snapshot_cache) == 4
+
+
+def test_read_snapshots_from_disk_walks_snapshot_logs(mock_transport):
+    """Test that hourly snapshot logs load unexpired records and survive a torn tail."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        node = Node(
+            host="local",
+            port=42042,
+            transport=mock_transport,
+            metrics_dir=tmpdir,
+        )
+        peer_dir = Path(tmpdir) / "peer"
+        peer_dir.mkdir()
+        now = int(time())
+        ttl = node.metrics_snapshot_ttl_seconds
+        expired = now - ttl - 60
+        stale_log = snapshot_log_path(peer_dir, now - ttl - 7200)
+        append_snapshot_record(stale_log, now - ttl - 7200, "{}")
+        for timestamp in (expired, now - 30, now):
+            append_snapshot_record(snapshot_log_path(peer_dir, timestamp), timestamp, f'{{"t": {timestamp}}}')
+        # A writer that died mid-record leaves a partial header behind
+        with open(snapshot_log_path(peer_dir, now), "ab") as f:
+            f.write(b"\x01\x02")
+
+        loaded, error_count = node._read_snapshots_from_disk()
+
+        assert sorted(loaded) == [
+            ("peer", now - 30, f'{{"t": {now - 30}}}'),
+            ("peer", now, f'{{"t": {now}}}'),
+        ]
+        assert error_count == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_save_loop_caches_own_snapshot(mock_transport, monkeypatch):
+    """Test that a node's own snapshot is served from memory, not decoded from its JSON."""
+    import asyncio
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        node = Node(
+            host="local",
+            port=42042,
+            transport=mock_transport,
+            metrics_dir=tmpdir,
+        )
+        node.metrics_dir.mkdir(parents=True)
+        snapshot_data = {"counters": {}, "histograms": {}, "events": {}}
+        monkeypatch.setattr(collector, "snapshot", lambda reset=False: snapshot_data)
+
+        sleeps = 0
+
+        async def fake_sleep(_seconds):
+            nonlocal sleeps
+            sleeps += 1
+            if sleeps > 1:
+                raise asyncio.CancelledError
+
+        monkeypatch.setattr("ironswarm.node.asyncio.sleep", fake_sleep)
+        monkeypatch.setattr(Node, "_snapshot_from_metadata", MagicMock(side_effect=AssertionError))
+
+        with pytest.raises(asyncio.CancelledError):
+            await node.metrics_save_loop()
+
+        [snapshot] = node._get_snapshots_from_crdt()
+        assert snapshot.snapshot_data is snapshot_data
+        assert snapshot.node_identity == node.identity
@@ -1,3 +1,5 @@
+import asyncio
+import random
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -14,6 +16,8 @@ def mock_transport():
     transport.port = 42042
     transport.listen = AsyncMock()
     transport.send = AsyncMock()  # Ensure send is AsyncMock
+    transport.send_multi = AsyncMock()
+    transport.announce = AsyncMock()
     transport.bind = MagicMock()
     return transport
 
@@ -55,12 +59,89 @@ async def test_bind(crdt_sync_node):
     assert crdt_sync_node.identity in crdt_sync_node.state["node_register"].keys()
 
 
+@pytest.mark.asyncio
+async def test_io_pool_lives_from_bind_to_shutdown(crdt_sync_node):
+    assert crdt_sync_node._io_pool is None
+    await crdt_sync_node.bind()
+    io_pool = crdt_sync_node._io_pool
+    assert io_pool is not None
+
+    await crdt_sync_node.shutdown()
+
+    assert crdt_sync_node._io_pool is None
+    with pytest.raises(RuntimeError):
+        io_pool.submit(print)
+
+
 @pytest.mark.asyncio
 async def test_update_neighbours(crdt_sync_node):
     crdt_sync_node.state["node_register"].add("node1", host="127.0.0.1", port=42043)
     crdt_sync_node.state["node_register"].add("node2", host="127.0.0.1", port=42044)
     await crdt_sync_node.update_neighbours()
-    crdt_sync_node.transport.send.assert_called()
+    crdt_sync_node.transport.send_multi.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_update_neighbours_alone_sends_nothing(crdt_sync_node):
+    await crdt_sync_node.update_neighbours()
+    assert crdt_sync_node.identity in crdt_sync_node.state["node_register"]
+    crdt_sync_node.transport.send_multi.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_loop_gossips_when_register_changes(crdt_sync_node):
+    crdt_sync_node.state["node_register"].add("node1", host="127.0.0.1", port=42043)
+    task = asyncio.create_task(crdt_sync_node.update_loop())
+    await asyncio.sleep(0.05)
+    rounds = crdt_sync_node.transport.send_multi.call_count
+
+    # Well inside the 2s fallback, a change wakes the loop straight away
+    crdt_sync_node.state["node_register"].add("node2", host="127.0.0.1", port=42044)
+    await asyncio.sleep(0.05)
+    assert crdt_sync_node.transport.send_multi.call_count > rounds
+
+    crdt_sync_node.running = False
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_update_neighbours_isolates_send_failures(crdt_sync_node):
+    crdt_sync_node.state["node_register"].add("node1", host="127.0.0.1", port=42043)
+    crdt_sync_node.state["node_register"].add("node2", host="127.0.0.1", port=42044)
+
+    async def send_multi(nid, socket, keys, state):
+        if nid == "node1":
+            raise RuntimeError("peer went away")
+
+    crdt_sync_node.transport.send_multi = AsyncMock(side_effect=send_multi)
+    await crdt_sync_node.update_neighbours()
+
+    sent = {call.args[0]: call.args[2] for call in crdt_sync_node.transport.send_multi.call_args_list}
+    assert sent["node2"] == ["node_register", "scenarios", "metrics_snapshots"]
+
+
+def test_pick_random_neighbours_favours_nearby_peers(crdt_sync_node, monkeypatch):
+    # A seeded RNG for the node module only, so other tests keep theirs
+    monkeypatch.setattr("ironswarm.node.random", random.Random(1234))
+    crdt_sync_node._shared_fs_peers.add("local")
+    node_list = [
+        (crdt_sync_node.identity, {"host": "127.0.0.1", "port": 42042}),
+        ("local", {"host": "127.0.0.1", "port": 42043}),
+        ("same_host", {"host": "127.0.0.1", "port": 42044}),
+        *[(f"remote{i}", {"host": f"10.0.0.{i}", "port": 42042}) for i in range(8)],
+    ]
+
+    picks = {"local": 0, "same_host": 0, "remote0": 0}
+    for _ in range(2000):
+        chosen = crdt_sync_node.pick_random_neighbours(crdt_sync_node.identity, node_list, n=2)
+        assert len({nid for nid, _ in chosen}) == 2
+        assert crdt_sync_node.identity not in {nid for nid, _ in chosen}
+        for nid, _ in chosen:
+            if nid in picks:
+                picks[nid] += 1
+
+    assert picks["local"] > picks["same_host"] > picks["remote0"] > 0
+    assert len(crdt_sync_node.pick_random_neighbours(crdt_sync_node.identity, node_list, n=50)) == 10
 
 
 @pytest.mark.asyncio
@@ -68,3 +149,61 @@ async def test_shutdown(crdt_sync_node):
     await crdt_sync_node.shutdown()
     assert crdt_sync_node.running is False
     assert crdt_sync_node.identity not in crdt_sync_node.state["node_register"].keys()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_announces_departure_to_log2_peers(crdt_sync_node):
+    for i in range(8):
+        crdt_sync_node.state["node_register"].add(f"node{i}", host="10.0.0.9", port=42043 + i)
+
+    await crdt_sync_node.shutdown()
+
+    calls = crdt_sync_node.transport.announce.call_args_list
+    assert len(calls) == 3
+    crdt_sync_node.transport.send_multi.assert_not_called()
+    for call in calls:
+        nid, _socket, key, departure = call.args
+        assert nid.startswith("node") and key == "node_register"
+        assert departure.remove_set.keys() == {crdt_sync_node.identity}
+
+
+def test_node_has_no_instance_dict(crdt_sync_node):
+    assert not hasattr(crdt_sync_node, "__dict__")
+    with pytest.raises(AttributeError):
+        crdt_sync_node.undeclared = 1
+
+
+@pytest.mark.asyncio
+async def test_stats_logs_only_on_change(crdt_sync_node, monkeypatch, caplog):
+    ticks = 0
+
+    async def fake_sleep(_seconds):
+        nonlocal ticks
+        ticks += 1
+        if ticks == 2:
+            crdt_sync_node.state["node_register"].add("node1", host="127.0.0.1", port=42043)
+        if ticks == 4:
+            crdt_sync_node.running = False
+
+    monkeypatch.setattr("ironswarm.node.asyncio.sleep", fake_sleep)
+    with caplog.at_level("INFO", logger="ironswarm.node"):
+        await crdt_sync_node.stats()
+
+    lines = [r.message for r in caplog.records if "Node Count" in r.message]
+    assert len(lines) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_leaves_the_loop_task_factory_alone(crdt_sync_node, monkeypatch):
+    async def finish(*_args, **_kwargs):
+        return None
+
+    for name in ("update_loop", "metrics_save_loop", "peer_snapshot_save_loop"):
+        monkeypatch.setattr(Node, name, finish)
+    monkeypatch.setattr(crdt_sync_node.scheduler, "run", finish)
+    loop = asyncio.get_running_loop()
+    factory = loop.get_task_factory()
+
+    await crdt_sync_node.run()
+
+    assert loop.get_task_factory() is factory
@@ -27,8 +27,8 @@ class TestNodeIndexCaching:
         index2 = node.index
 
         assert index1 == index2
-        # Verify cache was used (internal state should be set)
-        assert node._cached_node_keys is not None
+        # Verify the sorted node list was maintained on the writes
+        assert node._sorted_nodes == sorted(node.state["node_register"].keys())
 
     def test_index_invalidated_on_register_change(self):
         """Test that cache is invalidated when node register changes."""
@@ -37,14 +37,34 @@ class TestNodeIndexCaching:
         node.state["node_register"].add("node2")
 
         index1 = node.index
-        old_cached_keys = node._cached_node_keys.copy()
+        assert node.count == 2
 
-        # Add new node - should invalidate cache
-        node.state["node_register"].add("node3")
+        # Add a node that sorts before everything - our index moves up one
+        node.state["node_register"].add("0")
         index2 = node.index
 
-        # Cache should have been invalidated and recalculated
-        assert node._cached_node_keys != old_cached_keys
+        assert node.count == 3
+        assert index2 == index1 + 1
+
+    def test_sorted_nodes_track_joins_and_leaves(self):
+        """Test that incremental updates keep index and count matching a full sort."""
+        node = Node(host="local", port=42042)
+        register = node.state["node_register"]
+        register.add(node.identity)
+        for name in ("a", "z", "m"):
+            register.add(name)
+        assert node.count == 4
+
+        register.remove("a", timestamp=time.time() + 1)
+        register.add("0")
+        expected = sorted(register.keys())
+
+        assert node.count == len(expected)
+        assert node.index == expected.index(node.identity)
+        assert node._sorted_nodes == expected
+
+        register.remove(node.identity, timestamp=time.time() + 1)
+        assert node.index is None
 
     def test_count_cached_when_unchanged(self):
         """Test that count is cached when node register doesn't change."""
@@ -65,13 +85,11 @@ class TestNodeIndexCaching:
         for i in range(100):
             node.state["node_register"].add(f"node{i}")
 
-        # First access (calculates) - do multiple to get stable timing
+        # Recomputing from scratch - do multiple to get stable timing
         times_uncached = []
         for _ in range(10):
-            node._index = None  # Force recalculation
-            node._cached_node_keys = None
             start = time.perf_counter()
-            _ = node.index
+            _ = sorted(node.state["node_register"].keys()).index("node50")
             times_uncached.append(time.perf_counter() - start)
         avg_uncached = sum(times_uncached) / len(times_uncached)
 
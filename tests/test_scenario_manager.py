@@ -6,7 +6,13 @@ import pytest
 
 from ironswarm.datapools import IterableDatapool
 from ironswarm.scenario import Journey, Scenario
-from ironswarm.scenario_manager import ScenarioManager, node_target_volume, spec_import
+from ironswarm.scenario_manager import (
+    ScenarioManager,
+    _spec_offset,
+    node_target_volume,
+    nodes_before_volume,
+    spec_import,
+)
 from ironswarm.volumemodel import VolumeModel
 
 
@@ -225,8 +231,8 @@ async def test_work_resolved_async():
     sm.running = True
     await asyncio.sleep(0.05)
     sm.running = False
-    assert isinstance(sm.work_resolved, list)
-    assert sm.work_resolved == []
+    assert isinstance(sm.work_resolved, set)
+    assert sm.work_resolved == set()
 
 
 @pytest.mark.asyncio
@@ -259,7 +265,7 @@ async def test_scenario_manager_resolve_no_work():
     mock_node = MockNode(index=0, count=2)
     # Start time in the past so scenario completes immediately
     sm = ScenarioManager(mock_node, time.time() - 2, quick_scenario)
-    sm.work_resolved.append(sm.work_index())
+    sm.work_resolved.add(sm.work_index())
     await sm._resolve()
     assert len(sm.work_resolved) == 1
 
@@ -303,6 +309,26 @@ async def test_scenario_manager_spawn_journeys():
         "Background tasks should be tracked (may complete immediately in test)"
 
 
+@pytest.mark.asyncio
+async def test_scenario_manager_spawn_journeys_datapool_exhausted():
+    """Test spawn_journeys stops counting once the datapool runs dry."""
+    scenario = Scenario(
+        journeys=[
+            Journey("tests.test_scenario_manager:dummy_journey", None, VolumeModel(target=3, duration=1)),
+        ],
+        interval=1,
+        journey_separation=0.01,
+    )
+    sm = ScenarioManager(MockNode(index=0, count=1), time.time(), scenario)
+
+    await sm.spawn_journeys(
+        "tests.test_scenario_manager:dummy_journey", [3], iter(["a", "b"])
+    )
+
+    assert sm.total_spawned_journeys == 2
+    await sm.cancel_tasks()
+
+
 @pytest.mark.asyncio
 async def test_scenario_immediate_termination():
     """Test that scenarios terminate immediately when stopped, without waiting for interval."""
@@ -571,3 +597,20 @@ class TestNodeTargetVolume:
             f"Expected spread <= {max_acceptable_spread} (much better than original bug spread of {num_journeys}). "
             f"Distribution: {work_per_node}"
         )
+
+
+@pytest.mark.parametrize("node_count", [1, 3, 7])
+@pytest.mark.parametrize("journey_offset", [0, 2, 5, 9])
+def test_nodes_before_volume_matches_per_node_sum(node_count, journey_offset):
+    for target_volume in range(0, 25):
+        for node_index in range(node_count + 1):
+            expected = sum(
+                node_target_volume(idx, node_count, target_volume, journey_offset=journey_offset)
+                for idx in range(node_index)
+            )
+            assert nodes_before_volume(node_index, node_count, target_volume, journey_offset) == expected
+
+
+def test_spec_offset_is_process_independent():
+    # A fixed value: str hash() would change with PYTHONHASHSEED
+    assert _spec_offset("tests.test_scenario_manager:dummy_journey") == 4195102686
@@ -5,17 +5,25 @@ These tests verify that the msgpack-based serialization provides
 security guarantees against malicious payloads.
 """
 
+import zlib
+
 import pytest
 
 from ironswarm.lwwelementset import LWWElementSet
 from ironswarm.serialization import (
+    COMPRESSED_FRAME_PREFIX,
     MAX_COLLECTION_SIZE,
     MAX_MESSAGE_SIZE,
     MAX_METADATA_KEYS,
     MAX_STRING_LENGTH,
     SerializationError,
     ValidationError,
+    compress_frame,
+    deserialize_digest,
+    deserialize_keys,
     deserialize_lww,
+    serialize_digest,
+    serialize_keys,
     serialize_lww,
     validate_lww_dict,
     validate_message_size,
@@ -133,6 +141,24 @@ class TestDeserializeLWW:
         with pytest.raises(ValidationError, match="Cannot be negative"):
             deserialize_lww(data)
 
+    def test_deserialize_error_names_element(self):
+        """Test that element errors report the offending element path."""
+        import msgpack
+
+        invalid_lww = {
+            "add_set": {
+                "node1": {"timestamp": 1.0},
+                "node2": {"timestamp": 1.0, "host": [1]},
+            },
+            "remove_set": {}
+        }
+        data = msgpack.packb(invalid_lww)
+        with pytest.raises(
+            ValidationError,
+            match=r"^LWWElementSet\.add_set\['node2'\]\.host: Unsupported type list$",
+        ):
+            deserialize_lww(data)
+
 
 class TestValidateLWWDict:
     """Test validate_lww_dict function."""
@@ -328,3 +354,59 @@ class TestSecurityScenarios:
         # or our validation catches it with ValidationError
         with pytest.raises((SerializationError, ValidationError), match="(Too many elements|exceeds max_map_len)"):
             deserialize_lww(data)
+
+
+class TestDigestSerialization:
+    """Test digest and key-list serialization used for anti-entropy gossip."""
+
+    def test_digest_round_trip(self):
+        """Test a digest survives serialization."""
+        lww = LWWElementSet()
+        lww.add("node1", timestamp=100.5, host="127.0.0.1")
+        lww.remove("node2", timestamp=200)
+
+        assert deserialize_digest(serialize_digest(lww.digest())) == lww.digest()
+
+    def test_digest_rejects_metadata(self):
+        """Test that full LWW payloads are not accepted as digests."""
+        lww = LWWElementSet()
+        lww.add("node1", timestamp=100)
+
+        with pytest.raises(ValidationError):
+            deserialize_digest(serialize_lww(lww))
+
+    def test_keys_round_trip(self):
+        """Test a key list survives serialization."""
+        assert deserialize_keys(serialize_keys(["a", "b"])) == ["a", "b"]
+
+    def test_keys_reject_non_strings(self):
+        """Test that non-string keys are rejected."""
+        with pytest.raises(ValidationError):
+            deserialize_keys(serialize_keys([1]))
+
+
+class TestCompressedFrames:
+    """Test zlib-compressed frames accepted by every deserializer."""
+
+    def test_compressed_round_trip(self):
+        """Test that a compressed LWW frame deserializes and is smaller."""
+        lww = LWWElementSet()
+        for i in range(50):
+            lww.add(f"node{i}:1700000000", timestamp=100, snapshot_json='{"counters": {}}' * 20)
+
+        packed = serialize_lww(lww)
+        compressed = compress_frame(packed)
+
+        assert len(compressed) < len(packed) / 3
+        assert deserialize_lww(compressed).to_dict() == lww.to_dict()
+
+    def test_corrupt_compressed_frame(self):
+        """Test that a corrupt compressed frame is rejected."""
+        with pytest.raises(SerializationError):
+            deserialize_lww(COMPRESSED_FRAME_PREFIX + b"not zlib")
+
+    def test_decompression_bomb_rejected(self):
+        """Test that frames expanding past MAX_MESSAGE_SIZE are rejected."""
+        bomb = COMPRESSED_FRAME_PREFIX + zlib.compress(b"\x00" * (MAX_MESSAGE_SIZE + 1))
+        with pytest.raises(ValidationError):
+            deserialize_lww(bomb)
@@ -4,7 +4,12 @@ import pytest
 import zmq
 
 from ironswarm.lwwelementset import LWWElementSet
-from ironswarm.serialization import serialize_lww
+from ironswarm.serialization import (
+    COMPRESSED_FRAME_PREFIX,
+    compress_frame,
+    deserialize_lww,
+    serialize_lww,
+)
 from ironswarm.transport.zmq import ZMQTransport
 
 
@@ -107,3 +112,231 @@ async def test_send_recv_failure(zmq_transport, mock_state):
 
     # Verify that the node_id was removed from the state
     assert not mock_state["key1"].lookup("node1")
+
+
+@pytest.mark.asyncio
+async def test_send_known_peer_exchanges_digests(zmq_transport):
+    peer = ZMQTransport(host="127.0.0.1", port=5556, identity=b"peer")
+    ours = {"key1": LWWElementSet()}
+    theirs = {"key1": LWWElementSet()}
+    ours["key1"].add("mine", timestamp=100, host="a")
+    theirs["key1"].add("yours", timestamp=200, host="b")
+
+    # The peer answers through its own listen path
+    replies = []
+    peer.router.close()
+    peer.router = AsyncMock()
+    peer.router.send_multipart = AsyncMock(side_effect=lambda frames: replies.append(frames[1:]))
+
+    sent = []
+
+    async def dealer_send(frames):
+        sent.append(frames)
+        peer.router.recv_multipart = AsyncMock(return_value=(b"test_identity", *frames))
+        await peer._listen(theirs)
+
+    zmq_transport._connected_sockets.add("tcp://127.0.0.1:5556")
+    zmq_transport.dealer = AsyncMock()
+    zmq_transport.dealer.send_multipart = AsyncMock(side_effect=dealer_send)
+    zmq_transport.dealer.poll = AsyncMock(return_value=1)
+    zmq_transport.dealer.recv_multipart = AsyncMock(side_effect=lambda _flags: replies.pop())
+
+    await zmq_transport.send("peer", "tcp://127.0.0.1:5556", "key1", ours)
+
+    assert [frames[1] for frames in sent] == [b"key1_digest", b"key1_push"]
+    assert ours["key1"].keys() == theirs["key1"].keys() == {"mine", "yours"}
+    peer.dealer.close()
+    peer.context.term()
+
+
+@pytest.mark.asyncio
+async def test_send_multi_combines_keys_into_one_frame(zmq_transport):
+    peer = ZMQTransport(host="127.0.0.1", port=5556, identity=b"peer")
+    ours = {"key1": LWWElementSet(), "metrics_snapshots": LWWElementSet()}
+    theirs = {"key1": LWWElementSet(), "metrics_snapshots": LWWElementSet()}
+    ours["key1"].add("mine", timestamp=100, host="a")
+    theirs["key1"].add("yours", timestamp=200, host="b")
+    ours["metrics_snapshots"].add("s1", timestamp=100, data="x")
+
+    replies = []
+    peer.router.close()
+    peer.router = AsyncMock()
+    peer.router.send_multipart = AsyncMock(side_effect=lambda frames: replies.append(frames[1:]))
+
+    sent = []
+
+    async def dealer_send(frames):
+        sent.append(frames)
+        peer.router.recv_multipart = AsyncMock(return_value=(b"test_identity", *frames))
+        await peer._listen(theirs)
+
+    zmq_transport.dealer = AsyncMock()
+    zmq_transport.dealer.connect = MagicMock()
+    zmq_transport.dealer.send_multipart = AsyncMock(side_effect=dealer_send)
+    zmq_transport.dealer.poll = AsyncMock(return_value=1)
+    zmq_transport.dealer.recv_multipart = AsyncMock(side_effect=lambda _flags: replies.pop())
+
+    # First contact swaps full state for both keys in one round trip
+    await zmq_transport.send_multi("peer", "tcp://127.0.0.1:5556", ["key1", "metrics_snapshots"], ours)
+    assert [frames[1] for frames in sent] == [b"*state"]
+    assert ours["key1"].keys() == theirs["key1"].keys() == {"mine", "yours"}
+    assert theirs["metrics_snapshots"].keys() == {"s1"}
+
+    # Known peer exchanges digests, then pushes what the peer asked for
+    ours["metrics_snapshots"].add("s2", timestamp=300, data="y")
+    await zmq_transport.send_multi("peer", "tcp://127.0.0.1:5556", ["key1", "metrics_snapshots"], ours)
+    assert [frames[1] for frames in sent[1:]] == [b"*digest", b"*push"]
+    assert theirs["metrics_snapshots"].keys() == {"s1", "s2"}
+    peer.dealer.close()
+    peer.context.term()
+
+
+@pytest.mark.asyncio
+async def test_send_multi_skips_stale_and_undecodable_replies(zmq_transport):
+    ours = {"key1": LWWElementSet()}
+    theirs = LWWElementSet()
+    theirs.add("yours", timestamp=200)
+
+    zmq_transport.dealer = AsyncMock()
+    zmq_transport.dealer.connect = MagicMock()
+    zmq_transport.dealer.poll = AsyncMock(return_value=1)
+    zmq_transport.dealer.recv_multipart = AsyncMock(side_effect=[
+        # A late reply to an earlier per-key exchange is not ours
+        (b"", b"key1", serialize_lww(theirs)),
+        (b"", b"*state", b"key1", serialize_lww(theirs)),
+    ])
+
+    await zmq_transport.send_multi("peer", "tcp://127.0.0.1:5556", ["key1"], ours)
+
+    assert zmq_transport.dealer.recv_multipart.call_count == 2
+    assert ours["key1"].keys() == {"yours"}
+
+    # A reply whose key frame is not UTF-8 fails the exchange without merging
+    zmq_transport._connected_sockets.clear()
+    ours = {"key1": LWWElementSet()}
+    zmq_transport.dealer.recv_multipart = AsyncMock(
+        return_value=(b"", b"*state", b"\xff", serialize_lww(theirs))
+    )
+
+    await zmq_transport.send_multi("peer", "tcp://127.0.0.1:5556", ["key1"], ours)
+
+    assert ours["key1"].keys() == set()
+    assert "tcp://127.0.0.1:5556" in zmq_transport._connected_sockets
+
+
+@pytest.mark.asyncio
+async def test_send_multi_falls_back_to_per_key_for_older_peers(zmq_transport):
+    ours = {"key1": LWWElementSet(), "key2": LWWElementSet()}
+    theirs = LWWElementSet()
+    theirs.add("yours", timestamp=200)
+    sent = []
+
+    # An older peer ignores combined frames but answers single-key ones
+    async def dealer_send(frames):
+        sent.append(frames[1])
+
+    async def dealer_poll(_timeout):
+        return not sent[-1].startswith(b"*")
+
+    zmq_transport.dealer = AsyncMock()
+    zmq_transport.dealer.connect = MagicMock()
+    zmq_transport.dealer.disconnect = MagicMock()
+    zmq_transport.dealer.send_multipart = AsyncMock(side_effect=dealer_send)
+    zmq_transport.dealer.poll = AsyncMock(side_effect=dealer_poll)
+    zmq_transport.dealer.recv_multipart = AsyncMock(
+        side_effect=lambda _flags: (b"", sent[-1], serialize_lww(theirs))
+    )
+
+    await zmq_transport.send_multi("peer", "tcp://127.0.0.1:5556", ["key1", "key2"], ours)
+
+    assert sent == [b"*state", b"key1", b"key2"]
+    assert ours["key1"].keys() == ours["key2"].keys() == {"yours"}
+    zmq_transport.dealer.disconnect.assert_not_called()
+
+    # Later rounds go straight to per-key exchanges
+    sent.clear()
+    await zmq_transport.send_multi("peer", "tcp://127.0.0.1:5556", ["key1"], ours)
+    assert sent == [b"key1_digest"]
+
+
+@pytest.mark.asyncio
+async def test_send_multi_evicts_peer_that_never_answers(zmq_transport):
+    ours = {"key1": LWWElementSet(), "key2": LWWElementSet()}
+    ours["key1"].add("peer", timestamp=100)
+    ours["key2"].add("peer", timestamp=100)
+
+    zmq_transport.dealer = AsyncMock()
+    zmq_transport.dealer.connect = MagicMock()
+    zmq_transport.dealer.disconnect = MagicMock()
+    zmq_transport.dealer.send_multipart = AsyncMock()
+    zmq_transport.dealer.poll = AsyncMock(return_value=0)
+
+    await zmq_transport.send_multi("peer", "tcp://127.0.0.1:5556", ["key1", "key2"], ours)
+
+    # The combined frame, then one per-key retry before giving up
+    assert zmq_transport.dealer.send_multipart.call_count == 2
+    zmq_transport.dealer.disconnect.assert_called_once_with("tcp://127.0.0.1:5556")
+    assert not ours["key1"].lookup("peer")
+    assert not ours["key2"].lookup("peer")
+
+
+@pytest.mark.asyncio
+async def test_announce_waits_for_acknowledgement(zmq_transport):
+    peer = ZMQTransport(host="127.0.0.1", port=5556, identity=b"peer")
+    theirs = {"key1": LWWElementSet()}
+    theirs["key1"].add("leaving", timestamp=100)
+    departure = LWWElementSet()
+    departure.remove("leaving", timestamp=200)
+
+    replies = []
+    peer.router.close()
+    peer.router = AsyncMock()
+    peer.router.send_multipart = AsyncMock(side_effect=lambda frames: replies.append(frames[1:]))
+
+    async def dealer_send(frames):
+        peer.router.recv_multipart = AsyncMock(return_value=(b"test_identity", *frames))
+        await peer._listen(theirs)
+
+    zmq_transport.dealer = AsyncMock()
+    zmq_transport.dealer.connect = MagicMock()
+    zmq_transport.dealer.send_multipart = AsyncMock(side_effect=dealer_send)
+    zmq_transport.dealer.poll = AsyncMock(return_value=1)
+    zmq_transport.dealer.recv_multipart = AsyncMock(side_effect=lambda _flags: replies.pop())
+
+    await zmq_transport.announce("peer", "tcp://127.0.0.1:5556", "key1", departure)
+
+    zmq_transport.dealer.recv_multipart.assert_called_once()
+    assert not replies
+    assert theirs["key1"].keys() == set()
+    peer.dealer.close()
+    peer.context.term()
+
+
+@pytest.mark.asyncio
+async def test_send_compresses_metrics_snapshots(zmq_transport):
+    state = {"metrics_snapshots": LWWElementSet(), "key1": LWWElementSet()}
+    zmq_transport.dealer = AsyncMock()
+    zmq_transport.dealer.connect = MagicMock()
+    zmq_transport.dealer.send_multipart = AsyncMock()
+    zmq_transport.dealer.recv_multipart = AsyncMock(
+        return_value=(b"", b"metrics_snapshots", compress_frame(serialize_lww(LWWElementSet())))
+    )
+
+    await zmq_transport.send("node1", "tcp://127.0.0.1:5555", "metrics_snapshots", state)
+    await zmq_transport.send("node1", "tcp://127.0.0.1:5556", "key1", state)
+
+    [snapshots_frames], [key1_frames] = [c.args for c in zmq_transport.dealer.send_multipart.call_args_list]
+    assert snapshots_frames[2].startswith(COMPRESSED_FRAME_PREFIX)
+    assert not key1_frames[2].startswith(COMPRESSED_FRAME_PREFIX)
+
+
+def test_state_frames_are_reused_until_the_set_changes(zmq_transport):
+    lww = LWWElementSet()
+    lww.add("a", timestamp=100)
+
+    first = zmq_transport._encoded_state("key1", lww)
+    assert zmq_transport._encoded_state("key1", lww) is first
+    assert zmq_transport._encoded_digest("key1", lww) is zmq_transport._encoded_digest("key1", lww)
+
+    lww.add("b", timestamp=100)
+    assert deserialize_lww(zmq_transport._encoded_state("key1", lww)).keys() == {"a", "b"}